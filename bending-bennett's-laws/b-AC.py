@@ -1,7 +1,75 @@
+import functools
 import pennylane as qml
 import pennylane.numpy as np
 
 
+def unitary_table(matrices):
+    """
+    Stacks the encoding matrices after checking that each of them is unitary.
+
+    Args:
+        matrices (list(numpy.array)): The 4x4 matrices, indexed by the encoded bits.
+
+    Returns:
+        (numpy.array): An array of shape (len(matrices), 4, 4).
+    """
+    table = np.stack(matrices)
+    for index, matrix in enumerate(table):
+        if not np.allclose(matrix @ np.conj(matrix).T, np.eye(len(matrix))):
+            raise ValueError(f"The encoding of {index:03b} is not unitary.")
+    return table
+
+
+# U1
+U1 = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
+# U2
+U2 = np.array(
+    [
+        [1, 0, 0, 0],
+        [0, 1, 0, 0],
+        [0, 0, -1, 0],
+        [0, 0, 0, -1],
+    ]
+)
+# U3
+U3 = np.array([[0, 0, 1, 0], [0, 0, 0, 1], [1, 0, 0, 0], [0, 1, 0, 0]])
+# U4
+U4 = np.array(
+    [
+        [0, 0, 1, 0],
+        [0, 0, 0, 1],
+        [-1, 0, 0, 0],
+        [0, -1, 0, 0],
+    ]
+)
+# U5
+U5 = np.array([[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+# U6
+U6 = np.array(
+    [
+        [0, -1, 0, 0],
+        [1, 0, 0, 0],
+        [0, 0, 0, -1],
+        [0, 0, 1, 0],
+    ]
+)
+# U7
+U7 = np.array([[0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0], [1, 0, 0, 0]])
+# U8
+U8 = np.array(
+    [
+        [0, 0, 0, 1],
+        [0, 0, 1, 0],
+        [0, -1, 0, 0],
+        [-1, 0, 0, 0],
+    ]
+)
+
+
+# ENCODINGS[4 * i + 2 * j + k] encodes the bits i, j and k.
+ENCODINGS = unitary_table([U1, U7, U5, U3, U2, U8, U6, U4])
+
+
 def encode(i, j, k):
     """
     Quantum encoding function. It must act only on the first two qubits.
@@ -9,57 +77,28 @@ def encode(i, j, k):
 
     Args:
         i, j, k (int): The three encoding bits. They will take the values 1 or 0.
+            Arrays of bits broadcast the encoding over several messages.
 
     """
 
     # Put your code here #
-    # U1
-    U1 = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
-    # U2
-    U2 = np.array(
-        [
-            [1, 0, 0, 0],
-            [0, 1, 0, 0],
-            [0, 0, -1, 0],
-            [0, 0, 0, -1],
-        ]
-    )
-    # U3
-    U3 = np.array([[0, 0, 1, 0], [0, 1, 0, 1], [1, 0, 0, 0], [0, 1, 0, 0]])
-    # U4
-    U4 = np.array(
-        [
-            [0, 0, 1, 0],
-            [0, 1, 0, 1],
-            [-1, 0, 0, 0],
-            [0, -1, 0, 0],
-        ]
-    )
-    # U5
-    U5 = np.array([[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
-    # U6
-    U6 = np.array(
-        [
-            [0, -1, 0, 0],
-            [1, 0, 0, 0],
-            [0, 0, 0, -1],
-            [0, 0, 1, 0],
-        ]
-    )
-    # U7
-    U7 = np.array([[0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0], [1, 0, 0, 0]])
-    # U8
-    U8 = np.array(
-        [
-            [0, 0, 0, 1],
-            [0, 0, 1, 0],
-            [0, -1, 0, 0],
-            [-1, 0, 0, 0],
-        ]
-    )
-
-    U = [U1, U7, U5, U3, U2, U8, U6, U4]
-    qml.QubitUnitary(U[int(str(i) + str(j) + str(k), 2)], wires=[0, 1])
+    qml.QubitUnitary(ENCODINGS[4 * i + 2 * j + k], wires=[0, 1])
+
+
+@functools.lru_cache(maxsize=None)
+def encoding_tape(i, j, k):
+    """
+    The operations of encode(i, j, k), recorded once per bit pattern.
+
+    Args:
+        i, j, k (int): The three encoding bits. They will take the values 1 or 0.
+
+    Returns:
+        (pennylane.tape.QuantumTape): The tape holding the encoding gates.
+    """
+    with qml.tape.QuantumTape() as tape:
+        encode(i, j, k)
+    return tape
 
 
 def decode():
@@ -75,6 +114,16 @@ def decode():
     qml.Hadamard(0)
 
 
+def prepare():
+    """
+    Prepares the shared state 1/sqrt(2)(|000> + |111>).
+    """
+
+    qml.Hadamard(wires=0)
+    qml.CNOT(wires=[0, 1])
+    qml.CNOT(wires=[0, 2])
+
+
 dev = qml.device("default.qubit", wires=3)
 
 
@@ -85,12 +134,11 @@ def circuit(i, j, k):
 
     Args:
         i, j, k (int): The three encoding bits. They will take the value 1 or 0.
+            With arrays of bits, all those messages run as one broadcast circuit.
     """
 
     # We prepare the state 1/sqrt(2)(|000> + |111>)
-    qml.Hadamard(wires=0)
-    qml.CNOT(wires=[0, 1])
-    qml.CNOT(wires=[0, 2])
+    prepare()
 
     # Zenda encodes the bits
     encode(i, j, k)
@@ -112,17 +160,12 @@ def check(solution_output: str, expected_output: str) -> None:
     for i in range(2):
         for j in range(2):
             for k in range(2):
-                assert np.isclose(circuit(i, j, k)[4 * i + 2 * j + k], 1)
-
-                dev = qml.device("default.qubit", wires=3)
-
-                @qml.qnode(dev)
-                def circuit2(i, j, k):
-                    encode(i, j, k)
-                    return qml.probs(wires=range(3))
-
-                circuit2(i, j, k)
-                ops = circuit2.tape.operations
-
-                for op in ops:
+                for op in encoding_tape(i, j, k).operations:
                     assert not (2 in op.wires), "Invalid connection between qubits."
+
+    # All eight messages at once, through the challenge's own circuit. An encoding that
+    # ignores the bits gives a single unbroadcast row, shared by every message.
+    messages = np.arange(8)
+    probs = np.broadcast_to(circuit(messages // 4, messages // 2 % 2, messages % 2), (8, 8))
+    for message in range(8):
+        assert np.isclose(probs[message, message], 1)
@@ -1,4 +1,6 @@
+import itertools
 import json
+from concurrent.futures import ThreadPoolExecutor
 import pennylane as qml
 import pennylane.numpy as np
 
@@ -16,7 +18,61 @@ def U_psi(theta):
     qml.CRZ(theta, wires=[0, 1])
 
 
-def is_unsafe(alpha, beta, epsilon):
+FOURIER_DEGREE = 2
+
+
+def encoding_operator(alpha, beta):
+    """
+    The operator whose expectation over |psi> decides if alpha and beta are unsafe.
+
+    Args:
+        alpha (float): parameter used to encode the state.
+        beta (float): parameter used to encode the state.
+
+    Returns:
+        (pennylane.ops.Prod): The RX(beta) rotations applied after the RZ(alpha) ones on both qubits.
+    """
+    alpha_op = qml.prod(qml.RZ(alpha, wires=0), qml.RZ(alpha, wires=1))
+    beta_op = qml.prod(qml.RX(beta, wires=0), qml.RX(beta, wires=1))
+
+    return qml.prod(beta_op, alpha_op)
+
+
+def fourier_maximum(samples):
+    """
+    Finds the global maximum of a trigonometric polynomial from equally spaced samples.
+
+    The amplitudes of U_psi(theta)|00> are degree-1 trigonometric polynomials in theta, so
+    any expectation value over it is a degree-2 one and 2 * FOURIER_DEGREE + 1 samples over
+    one period determine it exactly. Its stationary points are the roots of a polynomial in
+    e^{i theta}, so the maximum is read off them instead of searched for.
+
+    Args:
+        samples (numpy.array): The function at theta = 2 pi j / len(samples).
+
+    Returns:
+        (float, float): The angle in [0, 2 pi) at which the maximum is reached, and the maximum.
+    """
+    coefficients = np.fft.rfft(np.real(samples)) / len(samples)
+    degrees = np.arange(len(coefficients))
+
+    def value(theta):
+        waves = coefficients[1:] * np.exp(1j * np.outer(theta, degrees[1:]))
+        return coefficients[0].real + 2 * np.sum(waves, axis=-1).real
+
+    # z^d f'(theta) / i is sum_k k (c_k z^(d + k) - conj(c_k) z^(d - k)), highest power first.
+    derivative = np.zeros(2 * len(degrees) - 1, dtype=complex)
+    derivative[len(degrees) - 1 - degrees] = degrees * coefficients
+    derivative[len(degrees) - 1 + degrees] -= degrees * np.conj(coefficients)
+    # theta = 0 stands in when the function is constant and there are no roots.
+    candidates = np.append(np.angle(np.roots(derivative)) % (2 * np.pi), 0.0)
+
+    values = value(candidates)
+    best = np.argmax(values)
+    return candidates[best], values[best]
+
+
+def is_unsafe(alpha, beta, epsilon, chunk_size=64, method="grid"):
     """
     Boolean function that we will use to know if a set of parameters is unsafe.
 
@@ -24,6 +80,9 @@ def is_unsafe(alpha, beta, epsilon):
         alpha (float): parameter used to encode the state.
         beta (float): parameter used to encode the state.
         epsilon (float): unsafe-tolerance.
+        chunk_size (int): number of thetas evaluated together in one broadcasted execution.
+        method (str): "grid" checks every theta in steps of 1e-2, "fourier" reconstructs the
+            expectation from a few samples and checks its exact maximum over theta.
 
     Returns:
         (bool): 'True' if alpha and beta are epsilon-unsafe coefficients. 'False' in the other case.
@@ -31,25 +90,117 @@ def is_unsafe(alpha, beta, epsilon):
     """
     device = qml.device("default.qubit", wires=2)
 
-    alpha_op = qml.prod(qml.RZ(alpha, wires=0), qml.RZ(alpha, wires=1))
-    beta_op = qml.prod(qml.RX(beta, wires=0), qml.RX(beta, wires=1))
-
-    final_operator = qml.prod(beta_op, alpha_op)
+    final_operator = encoding_operator(alpha, beta)
 
     @qml.qnode(device)
     def expectation(angle):
         U_psi(angle)
         return qml.expval(final_operator)
 
+    if method == "fourier":
+        samples = 2 * np.pi * np.arange(2 * FOURIER_DEGREE + 1) / (2 * FOURIER_DEGREE + 1)
+        theta, maximum = fourier_maximum(expectation(samples))
+
+        # The reconstruction is only trusted if the circuit agrees with it at the peak.
+        if np.isclose(expectation(theta), maximum, rtol=0, atol=1e-8):
+            return bool(maximum >= 1 - epsilon)
+
     # Put your code here #
     thetas = np.arange(0, 2 * np.pi, step=1e-2)
 
-    for theta in thetas:
-        if expectation(theta) >= 1 - epsilon:
+    # Each chunk is one broadcasted tape, and the sweep stops at the first chunk
+    # containing a theta that crosses the threshold.
+    for start in range(0, len(thetas), chunk_size):
+        if np.any(expectation(thetas[start : start + chunk_size]) >= 1 - epsilon):
             return True
     return False
 
 
+def U_psi_states(thetas, device):
+    """
+    The state vectors U_psi(theta)|00> for every theta, from one broadcasted execution.
+
+    Args:
+        thetas (numpy.array): Parameters that generate the states.
+        device (pennylane.Device): A two-qubit device.
+
+    Returns:
+        (numpy.array): An array of shape (len(thetas), 4).
+    """
+
+    @qml.qnode(device)
+    def state(angle):
+        U_psi(angle)
+        return qml.state()
+
+    return state(thetas)
+
+
+def max_expectations(alpha, betas, states):
+    """
+    The largest expectation of the encoding operator over the given states, for one row of the map.
+
+    The expectation is computed the way the device computes it: the states are rotated
+    by the diagonalizing gates and the probabilities are weighted by the eigenvalues.
+
+    Args:
+        alpha (float): parameter used to encode the state.
+        betas (numpy.array): parameters used to encode the state, one per cell of the row.
+        states (numpy.array): The states |psi> to maximize over, as returned by U_psi_states.
+
+    Returns:
+        (numpy.array): The maximum expectation for each beta.
+    """
+    maxima = []
+    for beta in betas:
+        final_operator = encoding_operator(alpha, beta)
+
+        rotation = np.eye(4)
+        for gate in final_operator.diagonalizing_gates():
+            rotation = qml.matrix(gate, wire_order=[0, 1]) @ rotation
+
+        probabilities = np.abs(states @ rotation.T) ** 2
+        maxima.append(np.max(probabilities @ np.real(qml.eigvals(final_operator))))
+
+    return np.array(maxima)
+
+
+def safety_map(alphas, betas, epsilon, workers=1):
+    """
+    Checks every (alpha, beta) pair of a grid against the same tolerance.
+
+    The states |psi> over the theta grid of is_unsafe are prepared once and shared by
+    all cells. Each row only costs a few small matrix products, so the rows are computed
+    in this process by default, and threads can share them out since numpy releases the
+    GIL in the products.
+
+    Args:
+        alphas (numpy.array): parameters used to encode the state, one per row.
+        betas (numpy.array): parameters used to encode the state, one per column.
+        epsilon (float): unsafe-tolerance.
+        workers (int): The number of threads computing rows. 1 computes them in the
+            calling thread.
+
+    Returns:
+        (numpy.array, numpy.array): The boolean map that is 'True' where alpha and beta
+        are epsilon-unsafe, and the maximum expectation of each cell.
+    """
+    device = qml.device("default.qubit", wires=2)
+    states = U_psi_states(np.arange(0, 2 * np.pi, step=1e-2), device)
+
+    rows = list(alphas)
+    if workers == 1:
+        maxima = [max_expectations(alpha, betas, states) for alpha in rows]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            maxima = list(
+                executor.map(max_expectations, rows, itertools.repeat(betas), itertools.repeat(states))
+            )
+
+    maxima = np.array(maxima).reshape(len(alphas), len(betas))
+    return maxima >= 1 - epsilon, maxima
+
+
 # These functions are responsible for testing the solution.
 def run(test_case_input: str) -> str:
     ins = json.loads(test_case_input)
@@ -1,8 +1,198 @@
+import itertools
 import json
+import numpy as onp
 import pennylane as qml
 import pennylane.numpy as np
 
-def half_life(gamma, p):
+DEL_T = 0.1
+
+
+def damping_superoperator(gamma, p, del_t):
+    """The superoperator of one Generalized Amplitude Damping step of length del_t.
+
+    Args:
+        gamma (float): The probability per unit time of losing a quantum of energy.
+        p (float): The de-excitation probability due to environmental effect
+        del_t (float): The length of the time step.
+
+    Returns:
+        (numpy.array): A 4x4 matrix acting on row-major vectorized density matrices.
+    """
+    kraus = qml.GeneralizedAmplitudeDamping(gamma * del_t, p, wires=0).kraus_matrices()
+    return sum(np.kron(K, np.conj(K)) for K in kraus)
+
+
+def elapsed(steps, del_t):
+    """The time reached after adding del_t steps times, rounded exactly like the scan does."""
+    t = 0
+    for t in itertools.accumulate(itertools.repeat(del_t, steps)):
+        pass
+    return t
+
+
+def check_relaxes(superoperator):
+    """Raises if the ground state population of the damped qubit never reaches 0.75.
+
+    Args:
+        superoperator (numpy.array): The superoperator of one damping step.
+    """
+    # One step maps the population x to a * x + b, since the trace stays 1.
+    a = (superoperator[0, 0] - superoperator[0, 3]).real
+    b = superoperator[0, 3].real
+    population = b / (1 - a) if a < 1 else 0.5
+    if population <= 0.75:
+        raise ValueError(f"The population settles at {population:.4f} and never reaches 0.75.")
+
+
+def initial_state():
+    """The vectorized density matrix of the state H|0> the system starts in."""
+    H = qml.matrix(qml.Hadamard(wires=0))
+    return np.outer(H[:, 0], np.conj(H[:, 0])).flatten()
+
+
+def incremental_half_life(gamma, p, del_t=DEL_T):
+    """Finds the half-life by carrying the density matrix forward one step at a time.
+
+    Each step applies the same channel, so its superoperator is built once and the
+    search costs one 4x4 matrix-vector product per step instead of rebuilding the
+    whole noise circuit.
+
+    Args:
+        gamma (float): The probability per unit time of losing a quantum of energy.
+        p (float): The de-excitation probability due to environmental effect
+        del_t (float): The length of the time step.
+
+    Returns:
+        (float): The first time at which the ground state population reaches 0.75.
+    """
+    superoperator = damping_superoperator(gamma, p, del_t)
+    check_relaxes(superoperator)
+    rho = initial_state()
+
+    t = 0
+    while rho[0].real < 0.75:
+        t += del_t
+        rho = superoperator @ rho
+
+    return t
+
+
+def bisect_half_life(gamma, p, del_t=DEL_T):
+    """Finds the half-life by bisecting over the number of steps.
+
+    The population after n steps is read off the n-th power of the one-step
+    superoperator. The number of steps is doubled until the population reaches 0.75
+    and the crossing is then bisected, so only O(log T) matrix powers are needed.
+
+    Args:
+        gamma (float): The probability per unit time of losing a quantum of energy.
+        p (float): The de-excitation probability due to environmental effect
+        del_t (float): The time resolution.
+
+    Returns:
+        (float): The first multiple of del_t at which the ground state population reaches 0.75.
+    """
+    superoperator = damping_superoperator(gamma, p, del_t)
+    check_relaxes(superoperator)
+    rho = initial_state()
+
+    def population(steps):
+        return (np.linalg.matrix_power(superoperator, steps) @ rho)[0].real
+
+    # population(low) < 0.75 <= population(high)
+    low, high = 0, 1
+    while population(high) < 0.75:
+        low, high = high, 2 * high
+
+    while high - low > 1:
+        middle = (low + high) // 2
+        if population(middle) < 0.75:
+            low = middle
+        else:
+            high = middle
+
+    return elapsed(high, del_t)
+
+
+def batched_superoperators(gammas, ps, del_t=DEL_T):
+    """The one-step superoperators for many (gamma, p) pairs at once.
+
+    The Kraus operators are sqrt(p) or sqrt(1 - p) times matrices that only depend on
+    gamma, so the superoperator is affine in p. It is interpolated between p = 0 and
+    p = 1, which only needs two sets of Kraus matrices per distinct gamma.
+
+    Args:
+        gammas (numpy.array): The probabilities per unit time of losing a quantum of energy.
+        ps (numpy.array): The de-excitation probabilities, with the same shape as gammas.
+        del_t (float): The length of the time step.
+
+    Returns:
+        (numpy.array): An array of shape (N, 4, 4) for the N flattened pairs.
+    """
+    distinct, inverse = onp.unique(onp.ravel(gammas), return_inverse=True)
+
+    def superoperators(p):
+        kraus = onp.array(
+            [qml.GeneralizedAmplitudeDamping.compute_kraus_matrices(gamma * del_t, p) for gamma in distinct]
+        ).reshape(len(distinct), 4, 2, 2)
+        # The batched version of sum(np.kron(K, np.conj(K)) for K in kraus).
+        return onp.einsum("nkij,nklm->niljm", kraus, kraus.conj()).reshape(len(distinct), 4, 4)
+
+    at_zero = superoperators(0.0)
+    slope = superoperators(1.0) - at_zero
+    return at_zero[inverse] + onp.ravel(ps)[:, None, None] * slope[inverse]
+
+
+def half_lives(gammas, ps, del_t=DEL_T):
+    """Calculates the half-life for arrays of (gamma, p) parameters together.
+
+    All density matrices are stepped forward as one (N, 4) array of vectorized states.
+    Each element records its time when its ground state population first reaches 0.75,
+    and finished elements are dropped from the batch so the work shrinks as it goes.
+
+    Args:
+        gammas (numpy.array): The probabilities per unit time of losing a quantum of energy.
+        ps (numpy.array): The de-excitation probabilities, broadcastable against gammas.
+        del_t (float): The length of the time step.
+
+    Returns:
+        (numpy.array): The half-lives in the broadcast shape of gammas and ps, with nan
+        where the population settles without ever reaching 0.75.
+    """
+    gammas, ps = onp.broadcast_arrays(onp.asarray(gammas, dtype=float), onp.asarray(ps, dtype=float))
+    superoperators = batched_superoperators(gammas, ps, del_t).real
+    result = onp.full(gammas.size, onp.nan)
+
+    # The same stationary population as in check_relaxes, for every element at once.
+    a = superoperators[:, 0, 0] - superoperators[:, 0, 3]
+    b = superoperators[:, 0, 3]
+    with onp.errstate(divide="ignore", invalid="ignore"):
+        settles = onp.where(a < 1, b / (1 - a), 0.5)
+
+    active = onp.flatnonzero(settles > 0.75)
+    superoperators = superoperators[active]
+    rho = onp.tile(onp.asarray(initial_state()).real, (len(active), 1))
+
+    t = 0
+    pending = onp.ones(len(active), dtype=bool)
+    while len(active):
+        t += del_t
+        rho = onp.einsum("nij,nj->ni", superoperators, rho)
+
+        done = pending & (rho[:, 0] >= 0.75)
+        result[active[done]] = t
+        pending &= ~done
+
+        # Finished elements keep being stepped until enough of them pile up to be
+        # worth copying the rest of the batch.
+        if 2 * pending.sum() <= len(pending):
+            active, superoperators, rho = active[pending], superoperators[pending], rho[pending]
+            pending = pending[pending]
+
+    return result.reshape(gammas.shape)
+
+
+def half_life(gamma, p, method="bisect", del_t=DEL_T):
     """Calculates the relaxation half-life of a quantum system that exchanges energy with its environment.
     This process is modeled via Generalized Amplitude Damping.
 
@@ -11,17 +201,24 @@ def half_life(gamma, p):
             The probability per unit time of the system losing a quantum of energy
             to the environment.
         p (float): The de-excitation probability due to environmental effect
+        method (str): "bisect" bisects the analytic population over the number of
+            steps, "incremental" steps a single density matrix forward and "scan"
+            re-runs the whole noise circuit for every candidate time.
+        del_t (float): The time resolution.
 
     Returns:
         (float): The relaxation haf-life of the system, as explained in the problem statement.
     """
 
+    if method == "bisect":
+        return bisect_half_life(gamma, p, del_t)
+    if method == "incremental":
+        return incremental_half_life(gamma, p, del_t)
+
     num_wires = 1
 
     dev = qml.device("default.mixed", wires=num_wires)
 
-    DEL_T = 0.1
-
     @qml.qnode(dev)
     def noise(
         gamma,
@@ -43,8 +240,8 @@ def half_life(gamma, p):
 
         time = 0
         while time < total_time:
-            time += DEL_T
-            qml.GeneralizedAmplitudeDamping(gamma * DEL_T, p, wires=0)
+            time += del_t
+            qml.GeneralizedAmplitudeDamping(gamma * del_t, p, wires=0)
 
         return qml.probs(wires=0)
 
@@ -53,7 +250,7 @@ def half_life(gamma, p):
     res = [0.5, 0.5]
 
     while res[0] < 0.75:
-        t += DEL_T
+        t += del_t
         res = noise(gamma, t)
 
     return t
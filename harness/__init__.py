@@ -0,0 +1,6 @@
+"""Tools for running and measuring the challenge solutions as a suite."""
+
+from .cache import ResultCache
+from .loader import discover, load_challenge, read_test_cases
+from .pool import warm_executor
+from .runner import collect, report, run_case, run_suite
@@ -0,0 +1,314 @@
+"""Command line entry point: ``python -m harness <command> ...``."""
+
+import argparse
+import contextlib
+import sys
+import time
+
+from .bench import compare, format_benchmarks, load_baseline, run_benchmarks, save_baseline
+from .bulk import run_suite_bulk
+from .cache import DEFAULT_DIRECTORY, ResultCache
+from .pool import warm_executor
+from .runner import report, run_suite
+from .stream import read_records, stream_results, write_results
+
+
+def _run(args):
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    executor = warm_executor(args.workers) if args.warm else None
+    start = time.perf_counter()
+    try:
+        if args.bulk:
+            results = run_suite_bulk(args.scripts or None, workers=args.workers, executor=executor)
+        else:
+            results = run_suite(
+                args.scripts or None,
+                workers=args.workers,
+                executor=executor,
+                profile=args.profile,
+                cache=cache,
+                memory=args.memory,
+                memory_budget=args.memory_budget and int(args.memory_budget * 2**20),
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    print(report(results, time.perf_counter() - start))
+
+    if args.profile:
+        from .profiler import folded_stacks, format_summary, summarize
+
+        summary = summarize(results)
+        print(format_summary(summary))
+        if args.flame:
+            with open(args.flame, "w", encoding="utf-8") as f:
+                f.write(folded_stacks(summary) + "\n")
+
+    if args.memory or args.memory_budget:
+        from .memory import format_memory
+
+        print(format_memory(results))
+    return 0 if all(r["verdict"] == "correct" for r in results) else 1
+
+
+def _bench(args):
+    executor = warm_executor(args.workers) if args.warm else None
+    try:
+        document = run_benchmarks(
+            args.scripts or None,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            with_check=args.with_check,
+            workers=args.workers,
+            executor=executor,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    print(format_benchmarks(document))
+
+    if args.output:
+        save_baseline(document, args.output)
+    if args.compare:
+        regressions = compare(load_baseline(args.compare), document, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+def _stream(args):
+    executor = warm_executor(args.workers) if args.warm else None
+    with contextlib.ExitStack() as stack:
+        source = sys.stdin if args.input == "-" else stack.enter_context(open(args.input))
+        sink = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, "w"))
+        try:
+            results = stream_results(
+                args.script,
+                read_records(source),
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                executor=executor,
+            )
+            counts = write_results(results, sink, keep_stdout=args.stdout)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    print(", ".join(f"{n} {verdict}" for verdict, n in sorted(counts.items())), file=sys.stderr)
+    return 0 if set(counts) <= {"correct"} else 1
+
+
+def _fuzz(args):
+    from .generators import PROPERTIES, fuzz
+
+    executor = warm_executor(args.workers) if args.warm else None
+    failed = False
+    try:
+        for path in args.scripts or list(PROPERTIES):
+            counts, failures, throughput = fuzz(
+                path, args.count, seed=args.seed, workers=args.workers, executor=executor
+            )
+            summary = ", ".join(f"{n} {verdict}" for verdict, n in sorted(counts.items()))
+            print(f"{path}: {summary} ({throughput:.1f} cases/s)")
+            for result in failures[: args.show]:
+                print(f"  input {result['input']}: {result['message']}")
+            failed = failed or bool(failures)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return 1 if failed else 0
+
+
+def _truthtable(args):
+    from .truthtable import TABLES, check_script
+
+    failed = False
+    for path in args.scripts or list(TABLES):
+        table, failures = check_script(path, atol=args.atol)
+        print(f"{path}: {len(table)} inputs, {len(failures)} wrong")
+        for bits, probability in failures:
+            print(f"  input {''.join(map(str, bits))}: expected output has probability {probability:.6f}")
+        failed = failed or bool(failures)
+    return 1 if failed else 0
+
+
+def _crosscheck(args):
+    from .crosscheck import SIMULATORS, crosscheck
+
+    failed = False
+    for name in args.simulators or list(SIMULATORS):
+        count, failures = crosscheck(name, args.count, seed=args.seed, atol=args.atol)
+        print(f"{name}: {count} samples, {len(failures)} differ from default.qubit")
+        for sample, differences in failures[: args.show]:
+            print(f"  sample {sample}: {'; '.join(differences)}")
+        failed = failed or bool(failures)
+    return 1 if failed else 0
+
+
+def _worker(args):
+    from .distributed import serve
+
+    def ready(address):
+        print(f"listening on {address[0]}:{address[1]}", flush=True)
+
+    try:
+        serve(args.host, args.port, ready=ready)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _distribute(args):
+    from .distributed import distribute, start_local_workers
+
+    addresses = []
+    for worker in args.worker:
+        host, port = worker.rsplit(":", 1)
+        addresses.append((host, int(port)))
+    processes = []
+    if args.local:
+        processes, local = start_local_workers(args.local)
+        addresses += local
+    if not addresses:
+        print("no workers given; use --worker HOST:PORT or --local N", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        results = distribute(addresses, args.scripts or None)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+    print(report(results, time.perf_counter() - start))
+    return 0 if all(r["verdict"] == "correct" for r in results) else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run every test case of the given scripts")
+    run.add_argument("scripts", nargs="*", help="script paths relative to the repository root")
+    run.add_argument("--workers", type=int, help="worker processes (default: number of cores)")
+    run.add_argument(
+        "--warm",
+        action="store_true",
+        help="fork workers from a server that has pennylane, autograd and scipy preloaded",
+    )
+    run.add_argument(
+        "--profile",
+        action="store_true",
+        help="split every QNode call into construction, expansion and execution time",
+    )
+    run.add_argument("--flame", help="with --profile, write folded stacks for flame graphs here")
+    run.add_argument(
+        "--bulk",
+        action="store_true",
+        help="evaluate each script's cases together through its run_batch, if it has one"
+        " (bypasses the cache; cannot be combined with --profile or --memory)",
+    )
+    run.add_argument(
+        "--memory", action="store_true", help="report peak heap, peak RSS and top allocation sites"
+    )
+    run.add_argument(
+        "--memory-budget",
+        type=float,
+        metavar="MIB",
+        help="fail cases whose peak heap or RSS growth exceeds this many MiB",
+    )
+    run.add_argument("--no-cache", action="store_true", help="always call run, ignoring the cache")
+    run.add_argument("--cache-dir", default=DEFAULT_DIRECTORY, help="where run outputs are cached")
+    run.set_defaults(func=_run)
+
+    bench = commands.add_parser("bench", help="time each script's run over its test cases")
+    bench.add_argument("scripts", nargs="*", help="script paths relative to the repository root")
+    bench.add_argument("--repeat", type=int, default=5, help="timed trials per script")
+    bench.add_argument("--warmup", type=int, default=1, help="untimed trials per script")
+    bench.add_argument("--with-check", action="store_true", help="time check together with run")
+    bench.add_argument("--workers", type=int, default=1, help="scripts benchmarked concurrently")
+    bench.add_argument("--warm", action="store_true", help="use a preloaded forkserver pool")
+    bench.add_argument("--output", help="write the results to this JSON baseline")
+    bench.add_argument("--compare", help="baseline JSON to compare against")
+    bench.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed relative growth of the median"
+    )
+    bench.set_defaults(func=_bench)
+
+    stream = commands.add_parser(
+        "stream", help="check JSONL records {input, expected} against one script"
+    )
+    stream.add_argument("script", help="script path relative to the repository root")
+    stream.add_argument("--input", default="-", help="JSONL file to read (default: stdin)")
+    stream.add_argument("--output", default="-", help="JSONL file to write (default: stdout)")
+    stream.add_argument("--workers", type=int, help="worker processes (default: number of cores)")
+    stream.add_argument("--chunk-size", type=int, default=256, help="records per job")
+    stream.add_argument("--warm", action="store_true", help="use a preloaded forkserver pool")
+    stream.add_argument("--stdout", action="store_true", help="keep captured script output")
+    stream.set_defaults(func=_stream)
+
+    fuzz = commands.add_parser("fuzz", help="check scripts against random reference cases")
+    fuzz.add_argument("scripts", nargs="*", help="scripts with a generator (default: all of them)")
+    fuzz.add_argument("-n", "--count", type=int, default=1000, help="cases per script")
+    fuzz.add_argument("--seed", type=int, help="seed of the input sampler")
+    fuzz.add_argument("--workers", type=int, help="worker processes (default: number of cores)")
+    fuzz.add_argument("--warm", action="store_true", help="use a preloaded forkserver pool")
+    fuzz.add_argument("--show", type=int, default=5, help="failures printed per script")
+    fuzz.set_defaults(func=_fuzz)
+
+    truthtable = commands.add_parser(
+        "truthtable", help="check Boolean-gate circuits on all their inputs in one pass"
+    )
+    truthtable.add_argument("scripts", nargs="*", help="scripts with a table (default: all of them)")
+    truthtable.add_argument(
+        "--atol", type=float, default=1e-8, help="allowed deviation of the expected output from 1"
+    )
+    truthtable.set_defaults(func=_truthtable)
+
+    crosscheck = commands.add_parser(
+        "crosscheck", help="compare the fast simulators with default.qubit on random circuits"
+    )
+    crosscheck.add_argument(
+        "simulators", nargs="*", help="stabilizer, reversible or checkpoint (default: all)"
+    )
+    crosscheck.add_argument("-n", "--count", type=int, default=300, help="samples per simulator")
+    crosscheck.add_argument("--seed", type=int, help="seed of the circuit sampler")
+    crosscheck.add_argument("--atol", type=float, default=1e-8, help="allowed deviation")
+    crosscheck.add_argument("--show", type=int, default=5, help="failures printed per simulator")
+    crosscheck.set_defaults(func=_crosscheck)
+
+    worker = commands.add_parser("worker", help="serve test case jobs over TCP")
+    worker.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    worker.add_argument("--port", type=int, default=0, help="port to listen on (default: any)")
+    worker.set_defaults(func=_worker)
+
+    distribute = commands.add_parser(
+        "distribute", help="shard the test cases over TCP workers with work stealing"
+    )
+    distribute.add_argument("scripts", nargs="*", help="script paths relative to the repository root")
+    distribute.add_argument(
+        "--worker", action="append", default=[], metavar="HOST:PORT", help="a running worker"
+    )
+    distribute.add_argument("--local", type=int, default=0, help="also start this many local workers")
+    distribute.set_defaults(func=_distribute)
+
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.bulk:
+        ignored = [
+            flag
+            for flag, given in [
+                ("--profile", args.profile),
+                ("--flame", args.flame),
+                ("--memory", args.memory),
+                ("--memory-budget", args.memory_budget is not None),
+                ("--cache-dir", args.cache_dir != DEFAULT_DIRECTORY),
+            ]
+            if given
+        ]
+        if ignored:
+            parser.error(f"--bulk does not support {', '.join(ignored)}")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Benchmarks of each challenge's ``run`` with JSON baselines.
+
+A benchmark of a script runs its ``run`` over all of its test cases ``warmup``
+times untimed and ``repeat`` times timed, then once more under ``tracemalloc`` to
+record the peak Python heap. ``compare`` flags scripts whose median time grew by
+more than a threshold relative to a stored baseline.
+"""
+
+import contextlib
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+
+from .loader import ROOT, discover
+from .runner import get_challenge
+
+# Differences below this many seconds are treated as timer noise.
+NOISE_FLOOR = 1e-3
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of ``values`` for ``q`` in [0, 100]."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def _trial(challenge, with_check):
+    for input_, expected_output in challenge.test_cases:
+        output = challenge.run(input_)
+        if with_check:
+            challenge.check(output, expected_output)
+
+
+def bench_script(path, repeat=5, warmup=1, with_check=False, root=ROOT):
+    """Benchmarks one script.
+
+    Args:
+        path (str): The script path, relative to ``root``.
+        repeat (int): Number of timed trials.
+        warmup (int): Number of untimed trials run first.
+        with_check (bool): Whether to time ``check`` together with ``run``. Scripts
+            whose ``run`` returns ``None`` do all of their work in ``check``.
+        root (str): The repository root.
+
+    Returns:
+        (dict): ``median`` and ``p95`` wall time per trial in seconds, ``executions``
+        (QNode calls per trial), ``peak_memory`` in bytes and ``times``, or an
+        ``error`` message if the script could not be benchmarked.
+    """
+    # Imported here so the parent process never has to import pennylane.
+    from .hooks import count_executions
+
+    try:
+        challenge = get_challenge(path, root)
+        for _ in range(warmup):
+            _trial(challenge, with_check)
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _trial(challenge, with_check)
+            times.append(time.perf_counter() - start)
+
+        counter = {}
+        tracemalloc.start()
+        try:
+            with count_executions(counter):
+                _trial(challenge, with_check)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    except Exception as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"}
+
+    return {
+        "median": statistics.median(times),
+        "p95": percentile(times, 95),
+        "executions": counter["executions"],
+        "peak_memory": peak_memory,
+        "times": times,
+    }
+
+
+def run_benchmarks(paths=None, repeat=5, warmup=1, with_check=False, workers=1, root=ROOT, executor=None):
+    """Benchmarks a set of scripts, one script per job.
+
+    Each script runs in its own job so the trials of one script never overlap.
+    Keep ``workers`` at 1 for stable timings unless the machine is otherwise idle.
+
+    Returns:
+        (dict): A baseline document with environment details and one entry per
+        script under ``"scripts"``.
+    """
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+        futures = {
+            path: executor.submit(bench_script, path, repeat, warmup, with_check, root)
+            for path in paths or discover(root)
+        }
+        scripts = {path: future.result() for path, future in futures.items()}
+
+    return {
+        "pennylane": metadata.version("pennylane"),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "with_check": with_check,
+        "scripts": scripts,
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    """Lists the scripts that got slower, or execute more QNodes, than in ``baseline``.
+
+    Args:
+        baseline (dict): A document produced by ``run_benchmarks``.
+        current (dict): Another such document.
+        threshold (float): Allowed relative growth of the median time.
+
+    Returns:
+        (list(str)): One message per regression.
+    """
+    regressions = []
+    for path, now in current["scripts"].items():
+        before = baseline["scripts"].get(path)
+        if before is None or "error" in before:
+            continue
+        if "error" in now:
+            regressions.append(f"{path}: now fails ({now['error']})")
+            continue
+        if now["median"] - before["median"] > max(threshold * before["median"], NOISE_FLOOR):
+            regressions.append(
+                f"{path}: median {before['median']:.4f}s -> {now['median']:.4f}s"
+                f" (+{now['median'] / before['median'] - 1:.0%})"
+            )
+        if now["executions"] > before["executions"]:
+            regressions.append(
+                f"{path}: QNode executions {before['executions']} -> {now['executions']}"
+            )
+    return regressions
+
+
+def format_benchmarks(document):
+    """Formats a benchmark document as a table."""
+    lines = [f"{'script':<40} {'median':>10} {'p95':>10} {'qnodes':>7} {'peak MiB':>9}"]
+    for path, entry in document["scripts"].items():
+        if "error" in entry:
+            lines.append(f"{path:<40} {entry['error']}")
+            continue
+        lines.append(
+            f"{path:<40} {entry['median']:>9.4f}s {entry['p95']:>9.4f}s"
+            f" {entry['executions']:>7} {entry['peak_memory'] / 2**20:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def load_baseline(filename):
+    with open(filename, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(document, filename):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
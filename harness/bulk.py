@@ -0,0 +1,99 @@
+"""Bulk evaluation of scripts that can run many test cases in one call.
+
+A script may define ``run_batch(test_case_inputs: list) -> list`` next to
+``run``. It receives many inputs at once, typically evaluates them as a single
+parameter-broadcast QNode call, and returns one output string per input, formatted
+exactly like ``run`` would. Each output is then checked with the script's
+``check`` as usual. Scripts without ``run_batch`` are run case by case.
+"""
+
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .loader import ROOT
+from .runner import check_output, collect, load_time, new_result, run_case
+
+CHUNK_SIZE = 1024
+
+
+def run_bulk(path, cases, root=ROOT, chunk_size=CHUNK_SIZE, check=None):
+    """Runs and checks all test cases of a script through its ``run_batch``.
+
+    A chunk whose ``run_batch`` call raises is retried case by case, so one bad
+    input only affects its own verdict.
+
+    Args:
+        path (str): The script path, relative to ``root``.
+        cases (list(tuple)): ``(index, input, expected_output)`` triples.
+        root (str): The repository root.
+        chunk_size (int): Maximum number of inputs per ``run_batch`` call.
+        check (callable): Used instead of the script's ``check`` if given.
+
+    Returns:
+        (list(dict)): One result per case, as produced by ``runner.run_case``.
+    """
+    stdout = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout):
+            challenge, startup = load_time(path, root)
+    except Exception:
+        return [run_case(path, *case, root=root, check=check) for case in cases]
+    if not hasattr(challenge, "run_batch"):
+        return [run_case(path, *case, root=root, check=check) for case in cases]
+
+    results = []
+    for first in range(0, len(cases), chunk_size):
+        chunk = cases[first : first + chunk_size]
+        stdout = io.StringIO()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(stdout):
+                outputs = challenge.run_batch([input_ for _, input_, _ in chunk])
+            if len(outputs) != len(chunk):
+                raise ValueError("run_batch must return one output per input")
+        except Exception:
+            results.extend(run_case(path, *case, root=root, check=check) for case in chunk)
+            continue
+        elapsed = time.perf_counter() - start
+
+        for (index, input_, expected_output), output in zip(chunk, outputs):
+            result = new_result(path, index, input_, expected_output)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(stdout):
+                result["output"] = output
+                result["verdict"], result["message"] = check_output(
+                    challenge, output, expected_output, check
+                )
+            result["time"] = elapsed / len(chunk) + time.perf_counter() - start
+            result["stdout"] = ""
+            results.append(result)
+        results[-len(chunk)]["stdout"] = stdout.getvalue()
+
+    if results:
+        results[0]["load_time"] = startup
+    return results
+
+
+def run_suite_bulk(paths=None, workers=None, root=ROOT, executor=None, chunk_size=CHUNK_SIZE):
+    """Like ``runner.run_suite``, but with one job per script evaluated in bulk.
+
+    Returns:
+        (list(dict)): One result per test case, ordered by script and index.
+    """
+    results = []
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+        scripts = {}
+        for path, index, input_, expected_output in collect(paths, root):
+            scripts.setdefault(path, []).append((index, input_, expected_output))
+        futures = [
+            executor.submit(run_bulk, path, cases, root, chunk_size)
+            for path, cases in scripts.items()
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+
+    return sorted(results, key=lambda r: (r["script"], r["index"]))
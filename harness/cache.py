@@ -0,0 +1,153 @@
+"""An on-disk cache of ``run`` outputs.
+
+Entries are content addressed: the key hashes the script source, the test case
+input and the installed pennylane version, so editing a script or upgrading
+pennylane simply stops matching old entries. Each entry is a small JSON file
+whose modification time doubles as its last use, and the least recently used
+entries are removed once the cache grows past its limits.
+"""
+
+import hashlib
+import json
+import os
+from importlib import metadata
+
+from .loader import ROOT
+
+DEFAULT_DIRECTORY = os.environ.get(
+    "HARNESS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "qhack2023-harness")
+)
+
+# An eviction shrinks the cache to this fraction of its limits, so a full cache is not
+# rescanned on every write.
+LOW_WATER = 0.9
+
+# Other processes write to the same directory, so the running totals of a cache are
+# refreshed by a full scan at least this often.
+SWEEP_INTERVAL = 1000
+
+_caches = {}
+
+
+def shared_cache(directory=DEFAULT_DIRECTORY, max_entries=10000, max_bytes=256 * 2**20):
+    """The one cache of this process with the given settings.
+
+    A ``ResultCache`` sent to a worker unpickles to this, so its running totals last
+    as long as the worker and are not rebuilt by a full scan for every job.
+    """
+    key = (directory, max_entries, max_bytes)
+    if key not in _caches:
+        _caches[key] = ResultCache(directory, max_entries, max_bytes)
+    return _caches[key]
+
+
+class ResultCache:
+    """A size-bounded, least-recently-used cache of ``run`` outputs.
+
+    Args:
+        directory (str): Where entries are stored.
+        max_entries (int): Number of entries above which old entries are evicted.
+        max_bytes (int): Total entry size above which old entries are evicted.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_entries=10000, max_bytes=256 * 2**20):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = metadata.version("pennylane")
+        # Running totals of the directory, from the last scan plus the writes since.
+        self._count = None
+        self._bytes = 0
+        self._puts = 0
+
+    def __reduce__(self):
+        return shared_cache, (self.directory, self.max_entries, self.max_bytes)
+
+    def key(self, path, input_, root=ROOT):
+        """The cache key of ``run(input_)`` for the script at ``path``."""
+        digest = hashlib.sha256()
+        with open(os.path.join(root, path), "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0" + json.dumps(input_).encode())
+        digest.update(b"\0" + self.version.encode())
+        return digest.hexdigest()
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key):
+        """Looks up an entry and marks it as recently used.
+
+        Returns:
+            (tuple(bool, str)): Whether the key was found and the cached output.
+        """
+        filename = self._filename(key)
+        try:
+            with open(filename, encoding="utf-8") as f:
+                output = json.load(f)["output"]
+            os.utime(filename)
+        except (OSError, ValueError, KeyError):
+            return False, None
+        return True, output
+
+    def put(self, key, output):
+        """Stores an output. Outputs that are not JSON serializable are skipped."""
+        try:
+            data = json.dumps({"output": output})
+        except TypeError:
+            return
+        filename = self._filename(key)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        # Write then rename so concurrent workers never read a partial entry.
+        partial = f"{filename}.{os.getpid()}.tmp"
+        existed = os.path.exists(filename)
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(partial, filename)
+
+        if self._count is None or self._puts >= SWEEP_INTERVAL:
+            self.evict()
+            return
+        self._puts += 1
+        if not existed:
+            self._count += 1
+            self._bytes += len(data.encode())
+        if self._count > self.max_entries or self._bytes > self.max_bytes:
+            self.evict()
+
+    def entries(self):
+        """Lists ``(last_used, size, filename)`` for every entry, oldest first."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                if not name.endswith(".json"):
+                    continue
+                filename = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, filename))
+        return sorted(entries)
+
+    def evict(self):
+        """Scans the cache and, if it is over a limit, removes least recently used entries
+        until it is within ``LOW_WATER`` of both limits."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if len(entries) > self.max_entries or total > self.max_bytes:
+            while entries and (
+                len(entries) > LOW_WATER * self.max_entries or total > LOW_WATER * self.max_bytes
+            ):
+                _, size, filename = entries.pop(0)
+                total -= size
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+        self._count, self._bytes, self._puts = len(entries), total, 0
+
+    def clear(self):
+        for _, _, filename in self.entries():
+            os.remove(filename)
+        self._count, self._bytes, self._puts = 0, 0, 0
@@ -0,0 +1,223 @@
+"""Statevector checkpoints for tapes that share a prefix of operations.
+
+Sweeps such as Shor's code over every injected error, or the superdense protocol
+over every message, run the same preparation before a suffix that changes. Every
+prefix of a tape gets a hash chained from the hashes of its operations, and the
+state after the prefix is kept in a bounded least-recently-used cache. A later tape
+resumes from its deepest cached prefix and only simulates the rest.
+
+A checkpoint only covers the wires its prefix touches, in the order they are first
+touched; every other wire is still in ``|0>``. Tapes with the same prefix therefore
+share checkpoints whatever wires their suffixes use. States are simulated gate by
+gate and never modified in place, so a checkpoint is a reference, not a copy. Cached
+arrays are made read-only, and results are returned as fresh arrays, so callers
+cannot change a checkpoint through what they get back.
+"""
+
+import collections
+import hashlib
+
+import numpy as np
+import pennylane as qml
+
+from .dense import apply
+from .stabilizer import MAX_DECOMPOSITION_DEPTH
+
+_PREPARATIONS = ("QubitStateVector", "StatePrep")
+
+
+class CheckpointCache:
+    """A least-recently-used cache of states keyed by prefix hash.
+
+    Args:
+        max_entries (int): Number of states kept.
+        max_bytes (int): Total size of the states kept.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=256 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.stats = collections.Counter()
+        self._states = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._states)
+
+    def deepest(self, hashes):
+        """The deepest cached prefix among ``hashes``, ordered from shortest to longest.
+
+        Returns:
+            (tuple(int, numpy.array, list)): The number of operations in the prefix, the
+            state after it and the wires of the state's axes, or ``(0, None, None)`` if
+            no prefix is cached.
+        """
+        for depth in range(len(hashes), 0, -1):
+            entry = self._states.get(hashes[depth - 1])
+            if entry is not None:
+                self._states.move_to_end(hashes[depth - 1])
+                self.stats["hits"] += 1
+                return (depth,) + entry
+        self.stats["misses"] += 1
+        return 0, None, None
+
+    def put(self, key, state, wires):
+        if key in self._states:
+            self._states.move_to_end(key)
+            return
+        state.setflags(write=False)
+        self._states[key] = (state, wires)
+        self.bytes += state.nbytes
+        while len(self._states) > self.max_entries or self.bytes > self.max_bytes:
+            _, (evicted, _) = self._states.popitem(last=False)
+            self.bytes -= evicted.nbytes
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        self._states.clear()
+        self.bytes = 0
+
+
+def prefix_hashes(operations):
+    """The hash of every prefix of ``operations``: entry ``i`` covers the first ``i + 1``."""
+    digest = hashlib.sha256()
+    hashes = []
+    for op in operations:
+        digest.update(f"\0{op.name}|{list(op.wires)}|{op.hash}".encode())
+        for parameter in op.parameters:
+            parameter = np.asarray(parameter)
+            digest.update(f"|{parameter.dtype}{parameter.shape}".encode() + parameter.tobytes())
+        hashes.append(digest.copy().hexdigest())
+    return hashes
+
+
+def _gates(op, depth=0):
+    """The operations with a matrix that ``op`` decomposes into, or ``None``."""
+    if op.has_matrix:
+        return [op]
+    if depth >= MAX_DECOMPOSITION_DEPTH:
+        return None
+    try:
+        decomposition = op.decomposition()
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    gates = []
+    for part in decomposition:
+        part = _gates(part, depth + 1)
+        if part is None:
+            return None
+        gates += part
+    return gates
+
+
+def _expval(matrix, axes):
+    def measure(state):
+        return float(np.vdot(state, apply(state, matrix, axes)).real)
+
+    return measure
+
+
+def _probs(axes):
+    def measure(state):
+        probs = np.abs(state) ** 2
+        probs = probs.sum(axis=tuple(axis for axis in range(state.ndim) if axis not in axes))
+        # The summed array keeps the axes in wire order; put them in measurement order.
+        return np.moveaxis(probs, np.argsort(np.argsort(axes)), range(len(axes))).reshape(-1)
+
+    return measure
+
+
+def compile_tape(tape):
+    """The checkpointed program of a tape.
+
+    Returns:
+        (tuple(list, list)): Every operation with the gates it is simulated by (``None``
+        for a leading state preparation), and the measurement evaluators, which take
+        the final state over the tape's wires. ``None`` if an operation has neither a
+        matrix nor a decomposition into such gates, or a measurement is not supported.
+    """
+    wire_map = {wire: index for index, wire in enumerate(tape.wires)}
+
+    steps = []
+    for index, op in enumerate(tape.operations):
+        if index == 0 and op.name in _PREPARATIONS:
+            steps.append((op, None))
+            continue
+        gates = _gates(op)
+        if gates is None:
+            return None
+        steps.append((op, gates))
+
+    measurements = []
+    for measurement in tape.measurements:
+        axes = [wire_map[wire] for wire in measurement.wires]
+        if isinstance(measurement, qml.measurements.ExpectationMP) and measurement.obs is not None:
+            try:
+                matrix = np.asarray(qml.matrix(measurement.obs, wire_order=measurement.wires))
+            except Exception:  # pylint: disable=broad-except
+                return None
+            measurements.append(_expval(matrix, axes))
+        elif isinstance(measurement, qml.measurements.ProbabilityMP) and measurement.obs is None:
+            measurements.append(_probs(axes or list(range(len(wire_map)))))
+        elif isinstance(measurement, qml.measurements.StateMP) and not measurement.wires:
+            measurements.append(lambda state: state.reshape(-1).copy())
+        else:
+            return None
+
+    return steps, measurements
+
+
+def _widen(state, wires, new_wires):
+    """Adds the wires of ``new_wires`` that ``state`` does not cover yet, in ``|0>``."""
+    for wire in new_wires:
+        if wire not in wires:
+            state = np.multiply.outer(state, np.array([1, 0], dtype=complex))
+            wires = wires + [wire]
+    return state, wires
+
+
+def execute(tape, cache, device=None):
+    """Executes a tape from the deepest checkpoint of its operation prefix.
+
+    The state after every operation simulated here is checkpointed. Tapes that
+    ``compile_tape`` cannot handle go to ``device`` instead.
+
+    Args:
+        tape (pennylane.tape.QuantumTape): The tape.
+        cache (CheckpointCache): Where checkpoints are looked up and stored.
+        device (pennylane.Device): The fallback. Defaults to ``default.qubit`` on the
+            tape's wires.
+
+    Returns:
+        The measurement results, a single one unpacked like a QNode does.
+    """
+    program = compile_tape(tape)
+    if program is None:
+        device = device or qml.device("default.qubit", wires=tape.wires)
+        return qml.execute([tape], device, None)[0]
+
+    steps, measurements = program
+    hashes = prefix_hashes([op for op, _ in steps])
+    depth, state, wires = cache.deepest(hashes)
+    if state is None:
+        state, wires = np.ones((), dtype=complex), []
+
+    cache.stats["resumed_operations"] += depth
+    for index in range(depth, len(steps)):
+        op, gates = steps[index]
+        if gates is None:
+            # A copy, so that the checkpoint does not change with the caller's vector.
+            state = np.array(op.parameters[0], dtype=complex).reshape((2,) * len(op.wires))
+            wires = list(op.wires)
+        for gate in gates or []:
+            state, wires = _widen(state, wires, gate.wires)
+            axes = [wires.index(wire) for wire in gate.wires]
+            state = apply(state, np.asarray(qml.matrix(gate)), axes)
+        cache.put(hashes[index], state, wires)
+        cache.stats["simulated_operations"] += 1
+
+    state, wires = _widen(state, wires, tape.wires)
+    state = np.transpose(state, [wires.index(wire) for wire in tape.wires])
+    results = [measure(state) for measure in measurements]
+    return results[0] if len(results) == 1 else tuple(results)
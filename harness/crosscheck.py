@@ -0,0 +1,189 @@
+"""Random-circuit equivalence checks of the fast simulators against ``default.qubit``.
+
+Each simulator gets a sampler of random tapes that stay on its fast path: Clifford
+circuits for ``harness.stabilizer``, permutation-heavy circuits with a few Hadamards
+for ``harness.reversible``, and batches of tapes sharing a prefix for
+``harness.checkpoint``. Every tape is run through the simulator and through
+``default.qubit`` on the tape's wires, and any difference is reported. A tape that
+would leave the fast path counts as a failure too, since comparing the device with
+itself checks nothing.
+
+Wires get mixed labels, so the wire maps are exercised along with the gates.
+"""
+
+import numpy as np
+import pennylane as qml
+
+from . import checkpoint, reversible, stabilizer
+
+# ``QubitStateVector`` was renamed ``StatePrep`` in later pennylane releases.
+_STATE_PREP = getattr(qml, "StatePrep", None) or getattr(qml, "QubitStateVector")
+
+_PAULIS = {"X": qml.PauliX, "Y": qml.PauliY, "Z": qml.PauliZ}
+
+_CLIFFORD_GATES = [
+    (1, qml.Hadamard),
+    (1, qml.S),
+    (1, lambda wires: qml.adjoint(qml.S(wires=wires))),
+    (1, qml.PauliX),
+    (1, qml.PauliY),
+    (1, qml.PauliZ),
+    (2, qml.CNOT),
+    (2, qml.CZ),
+    (2, qml.CY),
+    (2, qml.SWAP),
+]
+
+_REVERSIBLE_GATES = [
+    (1, qml.PauliX),
+    (1, qml.PauliX),
+    (1, qml.PauliY),
+    (1, qml.PauliZ),
+    (1, qml.S),
+    (1, qml.Hadamard),
+    (2, qml.CNOT),
+    (2, qml.CNOT),
+    (2, qml.CZ),
+    (2, qml.SWAP),
+    (3, qml.Toffoli),
+    (3, qml.Toffoli),
+]
+
+
+def _labels(num_wires):
+    return [f"w{i}" if i % 2 else i for i in range(num_wires)]
+
+
+def _random_gates(rng, gates, wires, depth):
+    operations = []
+    for _ in range(depth):
+        arity, gate = gates[rng.integers(len(gates))]
+        chosen = [wires[i] for i in rng.choice(len(wires), size=arity, replace=False)]
+        operations.append(gate(wires=chosen if arity > 1 else chosen[0]))
+    return operations
+
+
+def _pauli_word(rng, wires):
+    size = int(rng.integers(1, min(3, len(wires)) + 1))
+    chosen = [wires[i] for i in rng.choice(len(wires), size=size, replace=False)]
+    factors = [_PAULIS["XYZ"[rng.integers(3)]](wire) for wire in chosen]
+    word = factors[0]
+    for factor in factors[1:]:
+        word = word @ factor
+    return word
+
+
+def _pauli_measurements(rng, wires):
+    """An expectation of a Pauli word, of a sum of two and probabilities on some wires."""
+    chosen = [wires[i] for i in rng.choice(len(wires), size=min(3, len(wires)), replace=False)]
+    combination = qml.Hamiltonian(
+        rng.normal(size=2).tolist(), [_pauli_word(rng, wires), _pauli_word(rng, wires)]
+    )
+    return [
+        qml.expval(_pauli_word(rng, wires)),
+        qml.expval(combination),
+        qml.probs(wires=chosen),
+    ]
+
+
+def _reference(tape):
+    device = qml.device("default.qubit", wires=tape.wires)
+    results = qml.execute([tape], device, None)[0]
+    return results if len(tape.measurements) > 1 else (results,)
+
+
+def _differences(tape, results, atol):
+    results = results if len(tape.measurements) > 1 else (results,)
+    return [
+        f"{measurement}: {result} != {expected}"
+        for measurement, result, expected in zip(tape.measurements, results, _reference(tape))
+        if not np.allclose(result, expected, atol=atol)
+    ]
+
+
+def check_stabilizer(rng, atol=1e-8):
+    """Runs one random Clifford tape on the tableau and on the device.
+
+    Returns:
+        (list(str)): The differences, empty if the two agree.
+    """
+    wires = _labels(int(rng.integers(2, 7)))
+    operations = _random_gates(rng, _CLIFFORD_GATES, wires, int(rng.integers(1, 25)))
+    tape = qml.tape.QuantumScript(operations, _pauli_measurements(rng, wires))
+    if not stabilizer.is_clifford(tape):
+        return ["the tape left the tableau path"]
+    return _differences(tape, stabilizer.execute(tape), atol)
+
+
+def check_reversible(rng, atol=1e-8):
+    """Runs one random permutation-heavy tape on a sparse state and on the device.
+
+    Half the tapes start from a random state with a few nonzero amplitudes.
+    """
+    wires = _labels(int(rng.integers(3, 8)))
+    operations = []
+    if rng.integers(2):
+        prepared = [wires[i] for i in rng.choice(len(wires), size=3, replace=False)]
+        vector = np.zeros(8, dtype=complex)
+        support = rng.choice(8, size=int(rng.integers(1, 4)), replace=False)
+        vector[support] = rng.normal(size=len(support)) + 1j * rng.normal(size=len(support))
+        operations.append(_STATE_PREP(vector / np.linalg.norm(vector), wires=prepared))
+    operations += _random_gates(rng, _REVERSIBLE_GATES, wires, int(rng.integers(1, 25)))
+    tape = qml.tape.QuantumScript(operations, _pauli_measurements(rng, wires))
+    if not reversible.is_reversible(tape):
+        return ["the tape left the sparse path"]
+    return _differences(tape, reversible.execute(tape), atol)
+
+
+def check_checkpoint(rng, atol=1e-8, batch=8):
+    """Runs a batch of tapes that share a random prefix from one checkpoint cache.
+
+    Besides agreeing with the device, every tape after the first has to resume from
+    the shared prefix, whatever wires its suffix touches.
+    """
+    wires = _labels(int(rng.integers(4, 7)))
+    gates = _REVERSIBLE_GATES + [
+        (1, lambda wires: qml.RX(rng.uniform(-np.pi, np.pi), wires=wires)),
+        (2, lambda wires: qml.CRY(rng.uniform(-np.pi, np.pi), wires=wires)),
+    ]
+    prefix = _random_gates(rng, gates, wires[:-1], int(rng.integers(1, 6)))
+    cache = checkpoint.CheckpointCache()
+
+    failures = []
+    for _ in range(batch):
+        operations = prefix + _random_gates(rng, gates, wires, int(rng.integers(1, 6)))
+        measurements = _pauli_measurements(rng, wires)
+        measurements = [measurements[rng.integers(len(measurements))]]
+        if rng.integers(3) == 0:
+            measurements = [qml.state()]
+        tape = qml.tape.QuantumScript(operations, measurements)
+        if checkpoint.compile_tape(tape) is None:
+            return ["the tape left the checkpointed path"]
+        failures += _differences(tape, checkpoint.execute(tape, cache), atol)
+
+    if cache.stats["misses"] != 1:
+        failures.append(f"{cache.stats['misses']} of {batch} tapes missed the shared prefix")
+    return failures
+
+
+SIMULATORS = {
+    "stabilizer": check_stabilizer,
+    "reversible": check_reversible,
+    "checkpoint": check_checkpoint,
+}
+
+
+def crosscheck(name, count, seed=None, atol=1e-8):
+    """Compares a simulator with ``default.qubit`` on ``count`` random samples.
+
+    Returns:
+        (tuple(int, list(tuple(int, list(str))))): The number of samples and, for every
+        failing sample, its number and its differences.
+    """
+    rng = np.random.default_rng(seed)
+    failures = []
+    for sample in range(count):
+        differences = SIMULATORS[name](rng, atol)
+        if differences:
+            failures.append((sample, differences))
+    return count, failures
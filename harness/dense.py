@@ -0,0 +1,88 @@
+"""A small dense simulator used as an independent reference for the challenges.
+
+States are numpy arrays of shape ``(2,) * n`` and density matrices have shape
+``(2,) * 2n`` (row indices first). Nothing here depends on pennylane.
+"""
+
+import numpy as np
+
+I = np.eye(2, dtype=complex)
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+Y = np.array([[0, -1j], [1j, 0]], dtype=complex)
+Z = np.array([[1, 0], [0, -1]], dtype=complex)
+H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+PAULIS = {"I": I, "X": X, "Y": Y, "Z": Z}
+
+
+def ry(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def controlled(matrix, num_controls=1):
+    """The matrix of ``matrix`` controlled on ``num_controls`` leading wires."""
+    dimension = 2**num_controls * len(matrix)
+    full = np.eye(dimension, dtype=complex)
+    full[-len(matrix) :, -len(matrix) :] = matrix
+    return full
+
+
+CNOT = controlled(X)
+TOFFOLI = controlled(X, 2)
+
+
+def zero_state(num_wires):
+    state = np.zeros((2,) * num_wires, dtype=complex)
+    state[(0,) * num_wires] = 1
+    return state
+
+
+def apply(state, matrix, wires):
+    """Applies a gate on ``wires`` (first wire most significant) to a state tensor."""
+    k = len(wires)
+    tensor = matrix.reshape((2,) * 2 * k)
+    state = np.tensordot(tensor, state, axes=(list(range(k, 2 * k)), list(wires)))
+    return np.moveaxis(state, list(range(k)), list(wires))
+
+
+def expval_z(state, wire):
+    probs = np.abs(np.moveaxis(state, wire, 0).reshape(2, -1)) ** 2
+    return float(probs[0].sum() - probs[1].sum())
+
+
+def probs(state):
+    return (np.abs(state) ** 2).reshape(-1)
+
+
+def apply_channel(rho, kraus, wires):
+    """Applies a channel given by Kraus matrices on ``wires`` to a density tensor."""
+    num_wires = rho.ndim // 2
+    column_wires = [num_wires + w for w in wires]
+    out = np.zeros_like(rho)
+    for k in kraus:
+        out = out + apply(apply(rho, k, wires), k.conj(), column_wires)
+    return out
+
+
+def depolarizing(p):
+    return [np.sqrt(1 - p) * I] + [np.sqrt(p / 3) * P for P in (X, Y, Z)]
+
+
+def generalized_amplitude_damping(gamma, p):
+    """Kraus matrices in which ``p`` is the weight of decay towards ``|0>``.
+
+    This is the convention of the pennylane releases the solutions were written for;
+    later releases swap ``p`` and ``1 - p``.
+    """
+    return [
+        np.sqrt(p) * np.array([[1, 0], [0, np.sqrt(1 - gamma)]], dtype=complex),
+        np.sqrt(p) * np.array([[0, np.sqrt(gamma)], [0, 0]], dtype=complex),
+        np.sqrt(1 - p) * np.array([[np.sqrt(1 - gamma), 0], [0, 1]], dtype=complex),
+        np.sqrt(1 - p) * np.array([[0, 0], [np.sqrt(gamma), 0]], dtype=complex),
+    ]
+
+
+def trace_distance(rho, sigma):
+    dimension = int(np.sqrt(rho.size))
+    difference = np.reshape(rho, (dimension, dimension)) - np.reshape(sigma, (dimension, dimension))
+    return 0.5 * float(np.sum(np.abs(np.linalg.eigvalsh(difference))))
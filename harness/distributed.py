@@ -0,0 +1,209 @@
+"""Sharding the suite across worker processes that talk JSON over TCP.
+
+A worker (``serve``) listens on a port and answers one JSON line per job with one
+JSON line holding the ``runner.run_case`` result. The coordinator (``distribute``)
+splits the jobs into one shard per worker and drives every worker from its own
+thread. A worker that finishes its shard steals jobs from the back of the largest
+remaining shard, so one long job, such as the VQE in ``intro/e-AC.py``, only
+delays itself and not the rest of its shard. Jobs of a worker whose connection
+fails are handed to the others.
+
+Workers resolve script paths against their own repository root, so every host
+needs a checkout of the repository.
+"""
+
+import json
+import select
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+from .loader import ROOT
+from .runner import collect, new_result, run_case
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            job = json.loads(line)
+            # run_case redirects the process-wide stdout and shares the loaded scripts,
+            # so connections take turns running jobs.
+            with self.server.job_lock:
+                result = run_case(
+                    job["script"],
+                    job["index"],
+                    job["input"],
+                    job["expected"],
+                    root=self.server.root,
+                )
+            self.wfile.write(json.dumps(result, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.job_lock = threading.Lock()
+
+
+def serve(host="127.0.0.1", port=0, root=ROOT, ready=None):
+    """Runs a worker until interrupted.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+        root (str): The repository root scripts are resolved against.
+        ready (callable): Called with the bound ``(host, port)`` once listening.
+    """
+    with _Server((host, port), _JobHandler) as server:
+        server.root = root
+        if ready is not None:
+            ready(server.server_address)
+        server.serve_forever()
+
+
+class _Shards:
+    """Per-worker job queues with stealing from the largest other queue."""
+
+    def __init__(self, jobs, count):
+        self.queues = [jobs[i::count] for i in range(count)]
+        self.unfinished = len(jobs)
+        self.condition = threading.Condition()
+
+    def take(self, shard):
+        """The next job for ``shard``, or ``None`` once every job is finished.
+
+        With all queues empty but jobs still running elsewhere, this waits, since a
+        failing worker hands its job back.
+        """
+        with self.condition:
+            while True:
+                if self.queues[shard]:
+                    return self.queues[shard].pop(0)
+                victim = max(self.queues, key=len)
+                if victim:
+                    return victim.pop()
+                if not self.unfinished:
+                    return None
+                self.condition.wait()
+
+    def finish(self):
+        with self.condition:
+            self.unfinished -= 1
+            if not self.unfinished:
+                self.condition.notify_all()
+
+    def give_back(self, job, shard):
+        with self.condition:
+            self.queues[shard].insert(0, job)
+            self.condition.notify_all()
+
+    def drain(self):
+        with self.condition:
+            jobs = [job for queue in self.queues for job in queue]
+            for queue in self.queues:
+                queue.clear()
+            return jobs
+
+
+def _drive(address, shard, shards, results):
+    job = None
+    try:
+        with socket.create_connection(address) as connection:
+            stream = connection.makefile("rwb")
+            while (job := shards.take(shard)) is not None:
+                path, index, input_, expected_output = job
+                request = {
+                    "script": path, "index": index, "input": input_, "expected": expected_output
+                }
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise ConnectionError(f"worker {address[0]}:{address[1]} closed the connection")
+                result = json.loads(line)
+                result["worker"] = f"{address[0]}:{address[1]}"
+                results.append(result)
+                shards.finish()
+    except (OSError, ValueError):
+        # A lost connection or a reply that is not JSON: let the remaining workers run
+        # the job this one was given.
+        if job is not None:
+            shards.give_back(job, shard)
+
+
+def distribute(addresses, paths=None, root=ROOT):
+    """Runs the test cases of the given scripts on remote workers.
+
+    Args:
+        addresses (list(tuple(str, int))): The ``(host, port)`` of every worker.
+        paths (list(str)): Script paths relative to ``root``. Defaults to every script.
+        root (str): The repository root used to read the test cases.
+
+    Returns:
+        (list(dict)): One result per test case, ordered by script and index, each
+        with the ``worker`` that ran it.
+    """
+    jobs = collect(paths, root)
+    shards = _Shards(jobs, len(addresses))
+    results = []
+
+    threads = [
+        threading.Thread(target=_drive, args=(address, shard, shards, results))
+        for shard, address in enumerate(addresses)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Only left over if every worker failed; drivers of live workers wait for jobs
+    # handed back by failing ones until every job is finished.
+    for path, index, input_, expected_output in shards.drain():
+        result = new_result(path, index, input_, expected_output)
+        result["message"] = "Worker Error. No worker could run this case."
+        results.append(result)
+
+    return sorted(results, key=lambda r: (r["script"], r["index"]))
+
+
+def start_local_workers(count, host="127.0.0.1", timeout=30):
+    """Starts ``count`` worker processes on free local ports.
+
+    Returns:
+        (tuple(list(subprocess.Popen), list(tuple(str, int)))): The processes, to be
+        terminated by the caller, and their addresses.
+    """
+    processes, addresses = [], []
+    try:
+        for _ in range(count):
+            process = subprocess.Popen(
+                [sys.executable, "-m", "harness", "worker", "--host", host, "--port", "0"],
+                cwd=ROOT,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            processes.append(process)
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            # The worker prints its address once it is listening. Wait for the line
+            # with a timeout, since readline alone blocks for as long as the worker hangs.
+            remaining = max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([process.stdout], [], [], remaining)
+            line = process.stdout.readline() if ready else ""
+            if not line:
+                raise RuntimeError("a local worker failed to start")
+            worker_host, port = line.split()[-1].rsplit(":", 1)
+            addresses.append((worker_host, int(port)))
+    except BaseException:
+        for process in processes:
+            process.terminate()
+            process.wait()
+        raise
+    return processes, addresses
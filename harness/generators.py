@@ -0,0 +1,151 @@
+"""Randomized test cases with reference answers from ``harness.dense``.
+
+Each property pairs a sampler of valid inputs with an optional check. The sampler
+takes a ``numpy.random.Generator`` and returns an ``(input, expected_output)`` pair
+of strings in the script's own test case format, with the expected output computed
+by the dense reference simulator. When ``check`` is ``None`` the script's own
+``check`` judges the output; scripts whose ``check`` does not compare anything get
+a numerical one here.
+"""
+
+import collections
+import functools
+import json
+import time
+
+import numpy as np
+
+from . import dense
+from .loader import ROOT
+from .stream import stream_results
+
+Property = collections.namedtuple("Property", ["sample", "check"])
+
+
+def assert_close(solution_output, expected_output, atol=1e-6):
+    solution_output = json.loads(solution_output)
+    expected_output = json.loads(expected_output)
+    assert np.allclose(solution_output, expected_output, atol=atol), "Differs from the reference."
+
+
+def sample_angles(rng):
+    angles = rng.uniform(-2 * np.pi, 2 * np.pi, size=2)
+    state = dense.zero_state(2)
+    state = dense.apply(state, dense.ry(angles[0]), [0])
+    state = dense.apply(state, dense.ry(angles[1]), [1])
+    return json.dumps(angles.tolist()), json.dumps(dense.probs(state).real.tolist())
+
+
+def sample_shor(rng):
+    """A random real single-qubit state and a random Pauli error for the 9-qubit Shor code."""
+    theta = rng.uniform(0, 2 * np.pi)
+    amplitudes = [np.cos(theta), np.sin(theta)]
+    error_key = int(rng.integers(3))
+    qubit = int(rng.integers(9))
+
+    state = dense.zero_state(9)
+    state = dense.apply(state, np.array([[amplitudes[0], -amplitudes[1]], amplitudes[::-1]]), [0])
+
+    def encode_layer():
+        nonlocal state
+        for block in (0, 3, 6):
+            state = dense.apply(state, dense.CNOT, [block, block + 1])
+            state = dense.apply(state, dense.CNOT, [block, block + 2])
+
+    for target in (3, 6):
+        state = dense.apply(state, dense.CNOT, [0, target])
+    for block in (0, 3, 6):
+        state = dense.apply(state, dense.H, [block])
+    encode_layer()
+
+    state = dense.apply(state, [dense.X, dense.Y, dense.Z][error_key], [qubit])
+
+    encode_layer()
+    for block in (0, 3, 6):
+        state = dense.apply(state, dense.TOFFOLI, [block + 2, block + 1, block])
+    for block in (0, 3, 6):
+        state = dense.apply(state, dense.H, [block])
+    for target in (3, 6):
+        state = dense.apply(state, dense.CNOT, [0, target])
+    state = dense.apply(state, dense.TOFFOLI, [6, 3, 0])
+
+    expectations = [dense.expval_z(state, wire) for wire in range(9)]
+    return json.dumps([amplitudes, error_key, qubit]), json.dumps(expectations)
+
+
+def sample_half_life(rng, del_t=0.1):
+    """A random ``(gamma, p)`` whose ground-state population crosses 0.75."""
+    gamma = float(rng.uniform(0.1, 1.0))
+    p = float(rng.uniform(0.85, 1.0))
+
+    rho = np.full((2, 2), 0.5, dtype=complex)
+    kraus = dense.generalized_amplitude_damping(gamma * del_t, p)
+    t = 0
+    while rho[0, 0].real < 0.75:
+        t += del_t
+        rho = dense.apply_channel(rho, kraus, [0])
+    return json.dumps([gamma, p]), json.dumps(t)
+
+
+def sample_bound_verifier(rng, max_length=5):
+    """A random Pauli word and depolarizing strength for the trace distance bound."""
+    length = int(rng.integers(1, max_length + 1))
+    word = "".join(rng.choice(list("IXYZ"), size=length))
+    lmbda = float(rng.uniform(0, 1))
+
+    pauli = functools.reduce(np.kron, [dense.PAULIS[c] for c in word])
+    dimension = 2**length
+    rho = ((np.eye(dimension) + pauli) / dimension).reshape((2,) * 2 * length)
+    for wire in range(length):
+        rho = dense.apply_channel(rho, dense.depolarizing(lmbda), [wire])
+    sigma = np.eye(dimension) / dimension
+
+    bound = (1 - lmbda) ** sum(c != "I" for c in word)
+    return json.dumps([word, lmbda]), json.dumps(bound - dense.trace_distance(rho, sigma))
+
+
+PROPERTIES = {
+    "intro/b-AC.py": Property(sample_angles, None),
+    "intro/c-AC.py": Property(sample_shor, None),
+    "fall-of-sqynet/c-AC.py": Property(sample_half_life, None),
+    # Its check only prints, so compare against the reference directly.
+    "tale-of-timbits/c-AC.py": Property(
+        sample_bound_verifier, functools.partial(assert_close, atol=1e-6)
+    ),
+}
+
+
+def generate(path, count, seed=None):
+    """Yields ``count`` random ``(index, input, expected_output)`` cases for a script."""
+    rng = np.random.default_rng(seed)
+    sample = PROPERTIES[path].sample
+    for index in range(count):
+        yield (index, *sample(rng))
+
+
+def fuzz(path, count, seed=None, workers=None, root=ROOT, chunk_size=64, executor=None):
+    """Checks a script against ``count`` random reference cases across worker processes.
+
+    Cases are generated lazily in this process while workers evaluate earlier ones.
+
+    Returns:
+        (tuple(collections.Counter, list(dict), float)): Cases per verdict, the failed
+        results and the throughput in cases per second.
+    """
+    counts = collections.Counter()
+    failures = []
+    start = time.perf_counter()
+    results = stream_results(
+        path,
+        generate(path, count, seed),
+        workers=workers,
+        root=root,
+        chunk_size=chunk_size,
+        executor=executor,
+        check=PROPERTIES[path].check,
+    )
+    for result in results:
+        counts[result["verdict"]] += 1
+        if result["verdict"] != "correct":
+            failures.append(result)
+    return counts, failures, count / (time.perf_counter() - start)
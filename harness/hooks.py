@@ -0,0 +1,39 @@
+"""Temporary instrumentation of every QNode call in a process."""
+
+import contextlib
+
+import pennylane as qml
+
+
+@contextlib.contextmanager
+def wrap_qnodes(wrapper):
+    """Routes every ``QNode.__call__`` through ``wrapper`` while the context is open.
+
+    Args:
+        wrapper (callable): Called as ``wrapper(call, qnode, args, kwargs)`` where
+            ``call`` is the original ``QNode.__call__``. Its return value is the
+            result of the QNode call.
+    """
+    call = qml.QNode.__call__
+
+    def __call__(self, *args, **kwargs):
+        return wrapper(call, self, args, kwargs)
+
+    qml.QNode.__call__ = __call__
+    try:
+        yield
+    finally:
+        qml.QNode.__call__ = call
+
+
+@contextlib.contextmanager
+def count_executions(counter):
+    """Counts QNode calls into ``counter["executions"]``."""
+    counter.setdefault("executions", 0)
+
+    def wrapper(call, qnode, args, kwargs):
+        counter["executions"] += 1
+        return call(qnode, *args, **kwargs)
+
+    with wrap_qnodes(wrapper):
+        yield counter
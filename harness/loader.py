@@ -0,0 +1,128 @@
+"""Loading challenge scripts without running their module-level test loop.
+
+Every challenge script ends with the same ``for i, (input_, expected_output) in
+enumerate(test_cases)`` loop. The helpers here strip that loop from the parsed
+source before executing it, so ``run``, ``check`` and ``test_cases`` can be used
+from another process.
+"""
+
+import ast
+import os
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scripts such as ``bending-bennett's-laws/b-AC.py`` only define ``check``.
+DEFAULT_TEST_CASES = [["No input", "No output"]]
+
+
+def discover(root=ROOT):
+    """Lists every challenge script below the repository root.
+
+    Args:
+        root (str): The repository root.
+
+    Returns:
+        (list(str)): Script paths relative to ``root``, sorted.
+    """
+    scripts = []
+    for entry in sorted(os.listdir(root)):
+        directory = os.path.join(root, entry)
+        if entry.startswith(".") or entry == "harness" or not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                scripts.append(os.path.join(entry, name))
+    return scripts
+
+
+def _is_test_loop(node):
+    return (
+        isinstance(node, ast.For)
+        and isinstance(node.iter, ast.Call)
+        and isinstance(node.iter.func, ast.Name)
+        and node.iter.func.id == "enumerate"
+        and any(isinstance(arg, ast.Name) and arg.id == "test_cases" for arg in node.iter.args)
+    )
+
+
+# QNode attributes holding the circuit of the last call, as left behind by ``run``.
+_RUN_STATE_ATTRIBUTES = ("tape", "qtape")
+
+
+def _check_reads_run_state(tree):
+    """Whether the script's ``check`` reads the tape a QNode recorded in ``run``.
+
+    Such a check inspects whatever ``run`` left behind, so it is only meaningful right
+    after ``run`` itself, not after an output taken from the cache.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "check":
+            return any(
+                isinstance(child, ast.Attribute)
+                and child.attr in _RUN_STATE_ATTRIBUTES
+                # ``qml.tape`` is the module, not a recorded circuit.
+                and not (isinstance(child.value, ast.Name) and child.value.id == "qml")
+                for child in ast.walk(node)
+            )
+    return False
+
+
+def _parse(path, root=ROOT):
+    with open(os.path.join(root, path), encoding="utf-8") as f:
+        source = f.read()
+    return ast.parse(source, filename=path)
+
+
+def read_test_cases(path, root=ROOT):
+    """Reads the literal ``test_cases`` list of a script without importing it.
+
+    Args:
+        path (str): The script path, relative to ``root``.
+        root (str): The repository root.
+
+    Returns:
+        (list(list(str))): The ``[input, expected_output]`` pairs.
+    """
+    for node in _parse(path, root).body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id == "test_cases"
+        ):
+            return ast.literal_eval(node.value)
+    return DEFAULT_TEST_CASES
+
+
+def module_name(path):
+    """The name a script is registered under, e.g. ``intro.a_AC`` for ``intro/a-AC.py``."""
+    stem = os.path.splitext(path)[0]
+    return ".".join(
+        "".join(c if c.isalnum() else "_" for c in part) for part in stem.split(os.sep)
+    )
+
+
+def load_challenge(path, root=ROOT):
+    """Executes a script with its test loop removed.
+
+    Args:
+        path (str): The script path, relative to ``root``.
+        root (str): The repository root.
+
+    Returns:
+        (types.ModuleType): A module exposing the script's ``run``, ``check`` and
+        ``test_cases``, and ``check_reads_run_state`` telling whether ``check``
+        inspects the tapes ``run`` recorded.
+    """
+    tree = _parse(path, root)
+    tree.body = [node for node in tree.body if not _is_test_loop(node)]
+
+    module = types.ModuleType(module_name(path))
+    module.__file__ = os.path.join(root, path)
+    exec(compile(tree, module.__file__, "exec"), module.__dict__)
+
+    if not hasattr(module, "test_cases"):
+        module.test_cases = DEFAULT_TEST_CASES
+    module.check_reads_run_state = _check_reads_run_state(tree)
+    return module
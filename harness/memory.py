@@ -0,0 +1,148 @@
+"""Peak memory accounting for a block of code.
+
+Two numbers are tracked while the block runs:
+
+* the peak Python heap from ``tracemalloc``, which includes numpy buffers and is
+  attributed to the allocation sites that hold it at its highest point, and
+* the peak resident set size of the process, sampled by a background thread.
+"""
+
+import os
+import threading
+import tracemalloc
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+FRAMES = 16
+
+
+def rss_bytes():
+    """The current resident set size of this process, or the peak where unavailable."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        import resource
+
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if os.uname().sysname == "Darwin" else maxrss * 1024
+
+
+def _site(frame):
+    filename = frame.filename
+    if not filename.startswith("<"):
+        filename = os.path.relpath(filename)
+    return f"{filename}:{frame.lineno}"
+
+
+def top_sites(snapshot, script=None, limit=5):
+    """Groups a snapshot by allocation line and by the script line that led to it.
+
+    Args:
+        snapshot (tracemalloc.Snapshot): Taken with several frames per traceback.
+        script (str): Absolute path of the challenge script, used to find the line of
+            the script on whose behalf memory was allocated.
+        limit (int): Number of sites returned.
+
+    Returns:
+        (list(dict)): ``site``, ``via`` (the script line, if any) and ``size`` in
+        bytes, largest first.
+    """
+    # A trace with this file anywhere in its traceback comes from the sampler thread.
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__, all_frames=True),
+        ]
+    )
+    sizes = {}
+    for stat in snapshot.statistics("traceback"):
+        # Frames run from the oldest call to the allocation itself.
+        frames = list(stat.traceback)[::-1]
+        via = next((_site(frame) for frame in frames if frame.filename == script), None)
+        key = (_site(frames[0]), via)
+        sizes[key] = sizes.get(key, 0) + stat.size
+    ranked = sorted(sizes.items(), key=lambda item: -item[1])[:limit]
+    return [{"site": site, "via": via, "size": size} for (site, via), size in ranked]
+
+
+class MemoryMonitor:
+    """Records the peak heap and RSS of the code run inside ``with``.
+
+    Args:
+        interval (float): Seconds between samples of the background thread.
+        script (str): Absolute path of the challenge script, for attribution.
+
+    After the block, ``peak_heap`` and ``peak_rss`` hold the peaks in bytes,
+    ``rss_growth`` the peak RSS above its value on entry and ``sites`` the largest
+    allocation sites at the heap peak.
+    """
+
+    def __init__(self, interval=0.002, script=None):
+        self.interval = interval
+        self.script = script
+        self.peak_heap = 0
+        self.peak_rss = 0
+        self.rss_growth = 0
+        self.sites = []
+        self._snapshot = None
+        self._snapshot_size = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while True:
+            self.peak_rss = max(self.peak_rss, rss_bytes())
+            current = tracemalloc.get_traced_memory()[0]
+            # Snapshots are costly, so only retake one when the heap grew markedly.
+            if current > 1.1 * self._snapshot_size:
+                self._snapshot = tracemalloc.take_snapshot()
+                self._snapshot_size = current
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._start_rss = self.peak_rss = rss_bytes()
+        # Start the sampler first, so that setting up its thread is not traced.
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(FRAMES)
+        tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_heap = tracemalloc.get_traced_memory()[1]
+        self.peak_rss = max(self.peak_rss, rss_bytes())
+        self.rss_growth = self.peak_rss - self._start_rss
+        if self._snapshot is not None:
+            self.sites = top_sites(self._snapshot, self.script)
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def as_dict(self):
+        return {
+            "peak_heap": self.peak_heap,
+            "peak_rss": self.peak_rss,
+            "rss_growth": self.rss_growth,
+            "sites": self.sites,
+        }
+
+
+def format_memory(results):
+    """Formats the memory records attached to runner results."""
+    lines = []
+    for r in results:
+        memory = r.get("memory")
+        if not memory:
+            continue
+        lines.append(
+            f"{r['script']} [{r['index']}] heap {memory['peak_heap'] / 2**20:.2f} MiB,"
+            f" RSS {memory['peak_rss'] / 2**20:.1f} MiB (+{memory['rss_growth'] / 2**20:.1f} MiB)"
+        )
+        for site in memory["sites"]:
+            via = f" via {site['via']}" if site["via"] else ""
+            lines.append(f"  {site['size'] / 2**20:8.2f} MiB {site['site']}{via}")
+    return "\n".join(lines)
@@ -0,0 +1,41 @@
+"""A warm worker pool whose processes are forked from a preloaded server.
+
+Importing pennylane (and qchem/scipy for some scripts) takes far longer than most
+of the circuits do. With the ``forkserver`` start method the server process
+imports these modules once and every worker is forked from it, so a worker only
+pays for executing the challenge script itself.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+PRELOAD = ["pennylane", "pennylane.numpy", "pennylane.qchem", "autograd", "scipy", "scipy.linalg"]
+
+
+def _ready():
+    return os.getpid()
+
+
+def warm_executor(workers=None, preload=PRELOAD):
+    """Creates a process pool forked from a server that has ``preload`` imported.
+
+    Modules that fail to import are skipped by the server, so optional packages
+    can be listed safely.
+
+    Args:
+        workers (int): Number of worker processes. Defaults to the number of cores.
+        preload (list(str)): Modules imported once in the fork server.
+
+    Returns:
+        (concurrent.futures.ProcessPoolExecutor): The pool. It is already started,
+        so the preload cost is not attributed to the first job.
+    """
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(list(preload))
+
+    workers = workers or os.cpu_count()
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    for future in [executor.submit(_ready) for _ in range(workers)]:
+        future.result()
+    return executor
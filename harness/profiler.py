@@ -0,0 +1,197 @@
+"""Per-call profiling of QNodes.
+
+Each QNode call is split into
+
+* ``construction``: running the quantum function to build the tape
+  (``QNode.construct``),
+* ``execution``: time spent inside the device's execute methods,
+* ``expansion``: everything else, i.e. the transform program and device
+  preprocessing that decompose the tape, plus result post-processing.
+
+The tapes handed to the device are the decomposed ones, so their operation count
+and width give the number of operations after decomposition and the size of the
+simulated state.
+"""
+
+import collections
+import contextlib
+import time
+
+import pennylane as qml
+
+from .hooks import wrap_qnodes
+
+# New-style devices expose ``execute`` and friends; old-style devices funnel
+# everything through ``batch_execute``, which itself calls ``execute``.
+NEW_EXECUTE = (
+    "execute",
+    "execute_and_compute_derivatives",
+    "execute_and_compute_jvp",
+    "execute_and_compute_vjp",
+)
+OLD_EXECUTE = ("batch_execute",)
+
+BYTES_PER_AMPLITUDE = 16
+
+
+def state_bytes(device, tape):
+    """Size of the state a simulator allocates for ``tape``."""
+    name = getattr(device, "short_name", None) or getattr(device, "name", "")
+    num_wires = len(device.wires) if device.wires is not None else tape.num_wires
+    dimension = 4**num_wires if "mixed" in str(name) else 2**num_wires
+    return dimension * BYTES_PER_AMPLITUDE * (getattr(tape, "batch_size", None) or 1)
+
+
+def _tapes(circuits):
+    if isinstance(circuits, qml.tape.QuantumScript):
+        return [circuits]
+    return list(circuits)
+
+
+@contextlib.contextmanager
+def _timed_device(device, record):
+    names = OLD_EXECUTE if hasattr(device, "batch_execute") else NEW_EXECUTE
+    patched = []
+
+    for name in names:
+        if not hasattr(device, name) or name in vars(device):
+            continue
+        method = getattr(device, name)
+
+        def timed(circuits, *args, _method=method, **kwargs):
+            tapes = _tapes(circuits)
+            record["operations"] += sum(len(tape.operations) for tape in tapes)
+            record["state_bytes"] = max(
+                [record["state_bytes"]] + [state_bytes(device, tape) for tape in tapes]
+            )
+            start = time.perf_counter()
+            try:
+                return _method(circuits, *args, **kwargs)
+            finally:
+                record["execution"] += time.perf_counter() - start
+
+        setattr(device, name, timed)
+        patched.append(name)
+    try:
+        yield
+    finally:
+        for name in patched:
+            delattr(device, name)
+
+
+@contextlib.contextmanager
+def profile_qnodes(records):
+    """Appends one record per QNode call to ``records`` while the context is open.
+
+    Args:
+        records (list(dict)): Receives dictionaries with the ``qnode`` name, the
+            ``construction``, ``expansion``, ``execution`` and ``total`` times in
+            seconds, the number of ``operations`` after decomposition and the
+            largest ``state_bytes`` simulated.
+    """
+    construct = qml.QNode.construct
+    active = []
+
+    def timed_construct(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return construct(self, *args, **kwargs)
+        finally:
+            if active:
+                active[-1]["construction"] += time.perf_counter() - start
+
+    def wrapper(call, qnode, args, kwargs):
+        record = {
+            "qnode": getattr(qnode.func, "__name__", repr(qnode.func)),
+            "construction": 0.0,
+            "expansion": 0.0,
+            "execution": 0.0,
+            "total": 0.0,
+            "operations": 0,
+            "state_bytes": 0,
+        }
+        active.append(record)
+        start = time.perf_counter()
+        try:
+            with _timed_device(qnode.device, record):
+                return call(qnode, *args, **kwargs)
+        finally:
+            record["total"] = time.perf_counter() - start
+            record["expansion"] = max(
+                record["total"] - record["construction"] - record["execution"], 0.0
+            )
+            active.pop()
+            records.append(record)
+
+    qml.QNode.construct = timed_construct
+    try:
+        with wrap_qnodes(wrapper):
+            yield records
+    finally:
+        qml.QNode.construct = construct
+
+
+def summarize(results):
+    """Aggregates the profiles attached to runner results per script and QNode.
+
+    Args:
+        results (list(dict)): Runner results carrying a ``profile`` list.
+
+    Returns:
+        (dict): ``{script: {qnode: totals}}`` where ``totals`` holds the number of
+        ``calls``, summed times, summed ``operations`` and the largest ``state_bytes``.
+    """
+    summary = collections.defaultdict(dict)
+    for result in results:
+        for record in result.get("profile", []):
+            totals = summary[result["script"]].setdefault(
+                record["qnode"],
+                {
+                    "calls": 0,
+                    "construction": 0.0,
+                    "expansion": 0.0,
+                    "execution": 0.0,
+                    "total": 0.0,
+                    "operations": 0,
+                    "state_bytes": 0,
+                },
+            )
+            totals["calls"] += 1
+            for key in ("construction", "expansion", "execution", "total", "operations"):
+                totals[key] += record[key]
+            totals["state_bytes"] = max(totals["state_bytes"], record["state_bytes"])
+    return dict(summary)
+
+
+def folded_stacks(summary):
+    """Renders a summary in the folded-stack format read by flame graph tools.
+
+    Returns:
+        (str): Lines of ``script;qnode;phase microseconds``.
+    """
+    lines = []
+    for script, qnodes in summary.items():
+        for name, totals in qnodes.items():
+            for phase in ("construction", "expansion", "execution"):
+                microseconds = round(totals[phase] * 1e6)
+                if microseconds:
+                    lines.append(f"{script};{name};{phase} {microseconds}")
+    return "\n".join(lines)
+
+
+def format_summary(summary):
+    """Formats a summary as an indented tree with the share of each phase."""
+    lines = []
+    for script, qnodes in summary.items():
+        script_total = sum(totals["total"] for totals in qnodes.values())
+        lines.append(f"{script} {script_total:.4f}s")
+        for name, totals in sorted(qnodes.items(), key=lambda item: -item[1]["total"]):
+            lines.append(
+                f"  {name}: {totals['calls']} calls, {totals['total']:.4f}s,"
+                f" {totals['operations'] / totals['calls']:.0f} ops/call,"
+                f" state {totals['state_bytes'] / 2**10:.1f} KiB"
+            )
+            for phase in ("construction", "expansion", "execution"):
+                share = totals[phase] / totals["total"] if totals["total"] else 0.0
+                lines.append(f"    {phase:<12} {totals[phase]:.4f}s {share:>5.0%}")
+    return "\n".join(lines)
@@ -0,0 +1,213 @@
+"""A sparse statevector for circuits made mostly of permutation gates.
+
+X, CNOT, Toffoli and SWAP only permute computational basis states, so a state is
+kept as the array of its nonzero basis states (one row of bits per state) with their
+amplitudes, and these gates become column operations on the bits. Diagonal gates
+(Z, S, CZ) only touch the amplitudes. A Hadamard is the only gate that can grow the
+support, and equal basis states are merged right after it, so circuits like the Shor
+code decoder never build a ``2^n`` vector or matrix.
+
+``execute`` runs a tape this way when all its gates are supported and hands it to the
+device otherwise, like ``harness.stabilizer.execute``.
+"""
+
+import numpy as np
+import pennylane as qml
+
+from .stabilizer import flatten, pauli_terms
+
+# Amplitudes below this are dropped when basis states are merged.
+TOLERANCE = 1e-12
+
+
+class SparseState:
+    """A state of ``num_wires`` qubits stored as its nonzero basis states.
+
+    ``bits`` has one row per basis state and one column per wire, first wire most
+    significant, and ``amplitudes`` holds the matching amplitudes.
+    """
+
+    def __init__(self, num_wires, bits=None, amplitudes=None):
+        self.num_wires = num_wires
+        self.bits = np.zeros((1, num_wires), dtype=bool) if bits is None else bits
+        self.amplitudes = np.ones(1, dtype=complex) if amplitudes is None else amplitudes
+
+    @classmethod
+    def from_vector(cls, vector, wires, num_wires):
+        """The state with ``vector`` on ``wires`` and every other wire at ``|0>``."""
+        vector = np.asarray(vector, dtype=complex).reshape(-1)
+        support = np.flatnonzero(np.abs(vector) > TOLERANCE)
+        bits = np.zeros((len(support), num_wires), dtype=bool)
+        for position, wire in enumerate(wires):
+            bits[:, wire] = (support >> (len(wires) - 1 - position)) & 1
+        return cls(num_wires, bits, vector[support])
+
+    def copy(self):
+        return SparseState(self.num_wires, self.bits.copy(), self.amplitudes.copy())
+
+    def x(self, a):
+        self.bits[:, a] ^= True
+
+    def y(self, a):
+        self.amplitudes *= np.where(self.bits[:, a], -1j, 1j)
+        self.bits[:, a] ^= True
+
+    def z(self, a):
+        self.amplitudes *= np.where(self.bits[:, a], -1, 1)
+
+    def s(self, a):
+        self.amplitudes *= np.where(self.bits[:, a], 1j, 1)
+
+    def cnot(self, control, target):
+        self.bits[:, target] ^= self.bits[:, control]
+
+    def toffoli(self, first, second, target):
+        self.bits[:, target] ^= self.bits[:, first] & self.bits[:, second]
+
+    def swap(self, a, b):
+        self.bits[:, [a, b]] = self.bits[:, [b, a]]
+
+    def cz(self, a, b):
+        self.amplitudes *= np.where(self.bits[:, a] & self.bits[:, b], -1, 1)
+
+    def h(self, a):
+        signs = np.where(self.bits[:, a], -1, 1)
+        bits = np.concatenate([self.bits, self.bits])
+        bits[: len(self.bits), a] = False
+        bits[len(self.bits) :, a] = True
+        amplitudes = np.concatenate([self.amplitudes, signs * self.amplitudes]) / np.sqrt(2)
+        self.bits, self.amplitudes = bits, amplitudes
+        self.merge()
+
+    def keys(self):
+        """One hashable row per basis state."""
+        packed = np.ascontiguousarray(np.packbits(self.bits, axis=1))
+        return packed.view(np.dtype((np.void, packed.shape[1]))).reshape(-1)
+
+    def merge(self):
+        """Adds up the amplitudes of equal basis states and drops the ones that cancel."""
+        _, first, inverse = np.unique(self.keys(), return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        amplitudes = np.bincount(inverse, self.amplitudes.real) + 1j * np.bincount(
+            inverse, self.amplitudes.imag
+        )
+        kept = np.abs(amplitudes) > TOLERANCE
+        self.bits, self.amplitudes = self.bits[first[kept]], amplitudes[kept]
+
+    def probs(self, wires):
+        """The probabilities of the basis states of ``wires``, as ``qml.probs`` returns them."""
+        weights = 2 ** np.arange(len(wires))[::-1]
+        indices = self.bits[:, wires].astype(np.int64) @ weights
+        return np.bincount(indices, np.abs(self.amplitudes) ** 2, minlength=2 ** len(wires))
+
+    def expval(self, x, z):
+        """The expectation value of the Pauli word with X bits ``x`` and Z bits ``z``."""
+        x, z = np.asarray(x, dtype=bool), np.asarray(z, dtype=bool)
+        phases = 1j ** np.count_nonzero(x & z) * np.where(
+            np.count_nonzero(self.bits & z, axis=1) % 2, -1, 1
+        )
+        if not x.any():
+            return float(np.sum(np.abs(self.amplitudes) ** 2 * phases).real)
+
+        # <psi|P|psi> pairs each basis state with the one P maps it to.
+        positions = {key.tobytes(): i for i, key in enumerate(self.keys())}
+        moved = SparseState(self.num_wires, self.bits ^ x, phases * self.amplitudes)
+        total = 0j
+        for key, amplitude in zip(moved.keys(), moved.amplitudes):
+            position = positions.get(key.tobytes())
+            if position is not None:
+                total += np.conj(self.amplitudes[position]) * amplitude
+        return float(total.real)
+
+
+_GATES = {
+    "Identity": lambda state, *wires: None,
+    "PauliX": SparseState.x,
+    "PauliY": SparseState.y,
+    "PauliZ": SparseState.z,
+    "S": SparseState.s,
+    "Hadamard": SparseState.h,
+    "CNOT": SparseState.cnot,
+    "Toffoli": SparseState.toffoli,
+    "SWAP": SparseState.swap,
+    "CZ": SparseState.cz,
+}
+
+_PREPARATIONS = ("QubitStateVector", "StatePrep")
+
+
+def compile_tape(tape):
+    """The sparse program of a tape.
+
+    Returns:
+        (tuple): The initial state preparation (or ``None``), the ``(name, wires)``
+        gates, the measurement evaluators and the wire map, or ``None`` if the tape
+        uses a gate or measurement this simulator does not support.
+    """
+    wire_map = {wire: index for index, wire in enumerate(tape.wires)}
+    operations = list(tape.operations)
+
+    preparation = None
+    if operations and operations[0].name in _PREPARATIONS:
+        preparation = operations.pop(0)
+
+    gates = []
+    for operation in operations:
+        flattened = flatten(operation, _GATES)
+        if flattened is None:
+            return None
+        gates += flattened
+
+    measurements = []
+    for measurement in tape.measurements:
+        if isinstance(measurement, qml.measurements.ExpectationMP):
+            terms = pauli_terms(measurement.obs, wire_map)
+            if terms is None:
+                return None
+            measurements.append(
+                lambda state, terms=terms: sum(c * state.expval(x, z) for c, x, z in terms)
+            )
+        elif isinstance(measurement, qml.measurements.ProbabilityMP) and measurement.obs is None:
+            wires = [wire_map[wire] for wire in (measurement.wires or tape.wires)]
+            measurements.append(lambda state, wires=wires: state.probs(wires))
+        else:
+            return None
+
+    return preparation, gates, measurements, wire_map
+
+
+def is_reversible(tape):
+    """Whether ``execute`` runs the tape on a sparse state."""
+    return compile_tape(tape) is not None
+
+
+def execute(tape, device=None):
+    """Executes a tape on a sparse state if all its gates are supported, else on ``device``.
+
+    Args:
+        tape (pennylane.tape.QuantumTape): The tape.
+        device (pennylane.Device): The dense fallback. Defaults to ``default.qubit`` on
+            the tape's wires.
+
+    Returns:
+        The measurement results, a single one unpacked like a QNode does.
+    """
+    program = compile_tape(tape)
+    if program is None:
+        device = device or qml.device("default.qubit", wires=tape.wires)
+        return qml.execute([tape], device, None)[0]
+
+    preparation, gates, measurements, wire_map = program
+    if preparation is None:
+        state = SparseState(len(wire_map))
+    else:
+        state = SparseState.from_vector(
+            preparation.parameters[0],
+            [wire_map[wire] for wire in preparation.wires],
+            len(wire_map),
+        )
+    for name, wires in gates:
+        _GATES[name](state, *(wire_map[wire] for wire in wires))
+
+    results = [measure(state) for measure in measurements]
+    return results[0] if len(results) == 1 else tuple(results)
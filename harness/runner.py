@@ -0,0 +1,262 @@
+"""Running challenge test cases in a process pool.
+
+Each ``(script, test case)`` pair is an independent job. Workers load a script
+the first time they see it and keep it for the rest of their life, so a
+script's module-level devices and QNodes are built once per worker.
+"""
+
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .loader import ROOT, discover, load_challenge, read_test_cases
+
+_challenges = {}
+
+
+def get_challenge(path, root=ROOT):
+    """Loads a script once per process.
+
+    Args:
+        path (str): The script path, relative to ``root``.
+        root (str): The repository root.
+
+    Returns:
+        (types.ModuleType): The loaded challenge.
+    """
+    key = (root, path)
+    if key not in _challenges:
+        _challenges[key] = load_challenge(path, root)
+    return _challenges[key]
+
+
+def load_time(path, root=ROOT):
+    """Loads a script once per process and reports how long that took.
+
+    Returns:
+        (tuple(types.ModuleType, float)): The challenge and the time spent loading
+        it in this call, which is 0 when the worker already had it.
+    """
+    if (root, path) in _challenges:
+        return _challenges[(root, path)], 0.0
+    start = time.perf_counter()
+    challenge = get_challenge(path, root)
+    return challenge, time.perf_counter() - start
+
+
+def collect(paths=None, root=ROOT):
+    """Builds the job list for a set of scripts.
+
+    Args:
+        paths (list(str)): Script paths relative to ``root``. Defaults to every script.
+        root (str): The repository root.
+
+    Returns:
+        (list(tuple)): ``(path, index, input, expected_output)`` jobs.
+    """
+    jobs = []
+    for path in paths or discover(root):
+        try:
+            test_cases = read_test_cases(path, root)
+        except SyntaxError:
+            # Reported as a load error when the job runs.
+            test_cases = [[None, None]]
+        for index, (input_, expected_output) in enumerate(test_cases):
+            jobs.append((path, index, input_, expected_output))
+    return jobs
+
+
+def check_output(challenge, output, expected_output, check=None):
+    """Applies a script's ``check`` the way its own test loop does.
+
+    Args:
+        challenge (types.ModuleType): The loaded script.
+        output (str): What ``run`` returned.
+        expected_output (str): The expected output.
+        check (callable): Used instead of the script's ``check`` if given.
+
+    Returns:
+        (tuple(str, str)): The verdict (``"correct"``, ``"wrong"`` or ``"error"``)
+        and a message.
+    """
+    try:
+        message = (check or challenge.check)(output, expected_output)
+    except AssertionError as exc:
+        return "wrong", str(exc) or f"Have: '{output}'. Want: '{expected_output}'."
+    except Exception as exc:
+        return "error", f"Check Error. {exc}"
+    if message:
+        return "wrong", f"Have: '{output}'. Want: '{expected_output}'."
+    return "correct", ""
+
+
+def new_result(path, index, input_, expected_output):
+    """An ``"error"`` result for a test case that has not run yet."""
+    return {
+        "script": path,
+        "index": index,
+        "input": input_,
+        "expected": expected_output,
+        "output": None,
+        "verdict": "error",
+        "message": "",
+        "time": 0.0,
+        "load_time": 0.0,
+        "cached": False,
+    }
+
+
+def run_case(
+    path,
+    index,
+    input_,
+    expected_output,
+    root=ROOT,
+    profile=False,
+    cache=None,
+    check=None,
+    memory=False,
+    memory_budget=None,
+):
+    """Runs and checks a single test case.
+
+    Args:
+        path (str): The script path, relative to ``root``.
+        index (int): The position of the case in the script's ``test_cases``.
+        input_ (str): The test case input.
+        expected_output (str): The expected output.
+        root (str): The repository root.
+        profile (bool): Whether to record every QNode call under ``"profile"``.
+        cache (harness.cache.ResultCache): Where to look up and store ``run`` outputs.
+        check (callable): Used instead of the script's ``check`` if given.
+        memory (bool): Whether to record peak heap and RSS under ``"memory"``.
+        memory_budget (int): Bytes a case may use, measured as the larger of its peak
+            Python heap and its RSS growth. Cases above it fail. Implies ``memory``.
+
+    Returns:
+        (dict): The verdict, message, output, captured stdout and timings. ``time``
+        covers ``run`` and ``check``; ``load_time`` is the script start-up paid by
+        this case, if any. ``cached`` tells whether the output came from ``cache``.
+    """
+    result = new_result(path, index, input_, expected_output)
+    monitor = None
+    stdout = io.StringIO()
+    start = time.perf_counter()
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(contextlib.redirect_stdout(stdout))
+        try:
+            challenge, result["load_time"] = load_time(path, root)
+        except Exception as exc:
+            result["message"] = f"Load Error. {exc}"
+        else:
+            if profile:
+                from .profiler import profile_qnodes
+
+                result["profile"] = stack.enter_context(profile_qnodes([]))
+            if memory or memory_budget is not None:
+                from .memory import MemoryMonitor
+
+                monitor = stack.enter_context(MemoryMonitor(script=challenge.__file__))
+            start = time.perf_counter()
+            # A check that inspects the QNode tapes of run needs run to have happened.
+            key = None
+            if cache is not None and not challenge.check_reads_run_state:
+                key = cache.key(path, input_, root)
+            if key is not None:
+                result["cached"], output = cache.get(key)
+            try:
+                if not result["cached"]:
+                    output = challenge.run(input_)
+            except Exception as exc:
+                result["message"] = f"Runtime Error. {exc}"
+            else:
+                if key is not None and not result["cached"]:
+                    cache.put(key, output)
+                result["output"] = output
+                result["verdict"], result["message"] = check_output(
+                    challenge, output, expected_output, check
+                )
+
+    result["time"] = time.perf_counter() - start
+    result["stdout"] = stdout.getvalue()
+
+    if monitor is not None:
+        result["memory"] = monitor.as_dict()
+        used = max(monitor.peak_heap, monitor.rss_growth)
+        if memory_budget is not None and used > memory_budget and result["verdict"] != "error":
+            result["verdict"] = "error"
+            result["message"] = (
+                f"Memory Budget Exceeded. Used {used / 2**20:.1f} MiB,"
+                f" budget {memory_budget / 2**20:.1f} MiB."
+            )
+    return result
+
+
+def run_suite(paths=None, workers=None, root=ROOT, executor=None, **options):
+    """Fans every test case of the given scripts out over a process pool.
+
+    Args:
+        paths (list(str)): Script paths relative to ``root``. Defaults to every script.
+        workers (int): Number of worker processes. Defaults to the number of cores.
+        root (str): The repository root.
+        executor (concurrent.futures.Executor): An existing pool to submit to.
+        **options: Passed on to ``run_case``, e.g. ``profile``, ``cache`` or ``memory``.
+
+    Returns:
+        (list(dict)): One result per test case, ordered by script and index.
+    """
+    jobs = collect(paths, root)
+    results = []
+
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+            )
+        futures = [executor.submit(run_case, *job, root=root, **options) for job in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    return sorted(results, key=lambda r: (r["script"], r["index"]))
+
+
+def report(results, wall_time=None):
+    """Formats suite results as a plain-text report.
+
+    Args:
+        results (list(dict)): The output of ``run_suite``.
+        wall_time (float): Total elapsed time of the suite, if known.
+
+    Returns:
+        (str): One line per test case followed by a summary.
+    """
+    labels = {"correct": "Correct!", "wrong": "Wrong Answer.", "error": "Error."}
+    lines = []
+    for r in results:
+        line = f"{r['script']} [{r['index']}] {labels[r['verdict']]} ({r['time']:.2f}s"
+        if r.get("load_time"):
+            line += f", start-up {r['load_time']:.2f}s"
+        if r.get("cached"):
+            line += ", cached"
+        line += ")"
+        if r["message"]:
+            line += f" {r['message']}"
+        lines.append(line)
+
+    counts = {verdict: 0 for verdict in labels}
+    for r in results:
+        counts[r["verdict"]] += 1
+    summary = ", ".join(f"{n} {verdict}" for verdict, n in counts.items())
+    summary = f"{len(results)} test cases: {summary}."
+    if wall_time is not None:
+        cpu_time = sum(r["time"] for r in results)
+        startup = sum(r.get("load_time", 0.0) for r in results)
+        summary += (
+            f" Wall time {wall_time:.2f}s, summed case time {cpu_time:.2f}s,"
+            f" summed start-up {startup:.2f}s."
+        )
+    lines.append(summary)
+    return "\n".join(lines)
@@ -0,0 +1,307 @@
+"""A stabilizer tableau fast path for Clifford-only tapes.
+
+Circuits built from H, S, CNOT, CZ, Pauli gates and basis embeddings keep the state a
+stabilizer state, which the Aaronson-Gottesman (CHP) tableau stores in O(n^2) bits
+instead of 2^n amplitudes. ``execute`` runs such tapes on a tableau and hands every
+other tape to the device, so GHZ and Bell protocols can be scaled to hundreds of
+wires through the same call.
+
+Supported measurements are expectation values of Pauli words and of linear
+combinations of them, and probabilities. Probabilities are returned as dense vectors
+like ``qml.probs``; ``Tableau.distribution`` gives the nonzero entries only.
+"""
+
+import numpy as np
+import pennylane as qml
+
+MAX_DECOMPOSITION_DEPTH = 4
+
+
+def _phase_exponents(x1, z1, x2, z2):
+    """The power of i picked up when multiplying the Pauli (x1, z1) onto (x2, z2), per column."""
+    x1, z1, x2, z2 = (a.astype(np.int64) for a in (x1, z1, x2, z2))
+    return np.where(
+        x1 & z1,
+        z2 - x2,
+        np.where(x1, z2 * (2 * x2 - 1), z1 * x2 * (1 - 2 * z2)),
+    )
+
+
+class Tableau:
+    """The stabilizer state of ``num_qubits`` qubits, starting in ``|0...0>``.
+
+    Rows ``0..n-1`` are destabilizers, rows ``n..2n-1`` stabilizers and row ``2n`` is
+    scratch space. Each row is a Pauli with X bits ``x``, Z bits ``z`` and a sign bit ``r``.
+    """
+
+    def __init__(self, num_qubits):
+        self.n = num_qubits
+        self.x = np.zeros((2 * num_qubits + 1, num_qubits), dtype=bool)
+        self.z = np.zeros((2 * num_qubits + 1, num_qubits), dtype=bool)
+        self.r = np.zeros(2 * num_qubits + 1, dtype=bool)
+        self.x[np.arange(num_qubits), np.arange(num_qubits)] = True
+        self.z[num_qubits + np.arange(num_qubits), np.arange(num_qubits)] = True
+
+    def copy(self):
+        tableau = Tableau.__new__(Tableau)
+        tableau.n = self.n
+        tableau.x, tableau.z, tableau.r = self.x.copy(), self.z.copy(), self.r.copy()
+        return tableau
+
+    def h(self, a):
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a].copy(), self.x[:, a].copy()
+
+    def s(self, a):
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+
+    def cnot(self, a, b):
+        self.r ^= self.x[:, a] & self.z[:, b] & ~(self.x[:, b] ^ self.z[:, a])
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+
+    def pauli_x(self, a):
+        self.r ^= self.z[:, a]
+
+    def pauli_z(self, a):
+        self.r ^= self.x[:, a]
+
+    def pauli_y(self, a):
+        self.r ^= self.x[:, a] ^ self.z[:, a]
+
+    def _rowsum(self, targets, source):
+        """Multiplies row ``source`` onto each row in ``targets``."""
+        exponents = _phase_exponents(
+            self.x[source], self.z[source], self.x[targets], self.z[targets]
+        ).sum(axis=-1)
+        exponents += 2 * self.r[targets] + 2 * self.r[source]
+        self.r[targets] = exponents % 4 == 2
+        self.x[targets] ^= self.x[source]
+        self.z[targets] ^= self.z[source]
+
+    def measure(self, a, outcome=None):
+        """Measures qubit ``a`` in the computational basis and collapses the state.
+
+        Args:
+            a (int): The qubit.
+            outcome (int): For a random outcome, force this one instead of sampling it.
+
+        Returns:
+            (tuple(int, bool)): The outcome and whether it was deterministic.
+        """
+        n = self.n
+        candidates = np.flatnonzero(self.x[n : 2 * n, a])
+        if len(candidates):
+            p = n + candidates[0]
+            others = np.flatnonzero(self.x[: 2 * n, a])
+            self._rowsum(others[others != p], p)
+
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            self.x[p], self.z[p] = False, False
+            self.z[p, a] = True
+            self.r[p] = np.random.randint(2) if outcome is None else outcome
+            return int(self.r[p]), False
+
+        self._clear_scratch()
+        for i in np.flatnonzero(self.x[:n, a]):
+            self._rowsum([2 * n], n + i)
+        return int(self.r[2 * n]), True
+
+    def _clear_scratch(self):
+        self.x[-1], self.z[-1], self.r[-1] = False, False, False
+
+    def expval(self, x, z):
+        """The expectation value of the Pauli word with X bits ``x`` and Z bits ``z``.
+
+        A Y is a set X bit together with a set Z bit.
+        """
+        n = self.n
+        x, z = np.asarray(x, dtype=bool), np.asarray(z, dtype=bool)
+
+        # Anticommuting with a stabilizer means the word is not in the group: mean 0.
+        anticommuting = (self.x[n : 2 * n] & z).sum(axis=1) + (self.z[n : 2 * n] & x).sum(axis=1)
+        if np.any(anticommuting & 1):
+            return 0.0
+
+        # Otherwise it is +-1 times the product of the stabilizers whose destabilizer it
+        # anticommutes with; build that product in the scratch row and read its sign.
+        self._clear_scratch()
+        anticommuting = ((self.x[:n] & z).sum(axis=1) + (self.z[:n] & x).sum(axis=1)) & 1
+        for i in np.flatnonzero(anticommuting):
+            self._rowsum([2 * n], n + i)
+        return -1.0 if self.r[2 * n] else 1.0
+
+    def distribution(self, qubits):
+        """The nonzero probabilities of computational basis outcomes on ``qubits``.
+
+        Every outcome of a stabilizer state is either certain or a fair coin, so the
+        distribution is uniform over the branches and costs one tableau per branch.
+
+        Returns:
+            (dict): Maps outcome tuples, in the order of ``qubits``, to probabilities.
+        """
+        branches = [((), 1.0, self.copy())]
+        for a in qubits:
+            grown = []
+            for bits, probability, tableau in branches:
+                forked = tableau.copy()
+                outcome, deterministic = tableau.measure(a, outcome=0)
+                if deterministic:
+                    grown.append((bits + (outcome,), probability, tableau))
+                else:
+                    forked.measure(a, outcome=1)
+                    grown.append((bits + (0,), probability / 2, tableau))
+                    grown.append((bits + (1,), probability / 2, forked))
+            branches = grown
+        return {bits: probability for bits, probability, _ in branches}
+
+
+def flatten(operation, gates, depth=0):
+    """The gates of an operation as ``(name, wires)`` pairs, decomposing it until every gate
+    is a key of ``gates``, or ``None`` if that is not possible."""
+    if operation.name in gates:
+        return [(operation.name, list(operation.wires))]
+    if depth >= MAX_DECOMPOSITION_DEPTH:
+        return None
+    try:
+        decomposition = operation.decomposition()
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    flattened = []
+    for op in decomposition:
+        part = flatten(op, gates, depth + 1)
+        if part is None:
+            return None
+        flattened += part
+    return flattened
+
+
+def _sdg(tableau, a):
+    for _ in range(3):
+        tableau.s(a)
+
+
+def _cz(tableau, a, b):
+    tableau.h(b)
+    tableau.cnot(a, b)
+    tableau.h(b)
+
+
+def _cy(tableau, a, b):
+    _sdg(tableau, b)
+    tableau.cnot(a, b)
+    tableau.s(b)
+
+
+def _swap(tableau, a, b):
+    tableau.cnot(a, b)
+    tableau.cnot(b, a)
+    tableau.cnot(a, b)
+
+
+_GATES = {
+    "Identity": lambda tableau, *wires: None,
+    "Hadamard": Tableau.h,
+    "PauliX": Tableau.pauli_x,
+    "PauliY": Tableau.pauli_y,
+    "PauliZ": Tableau.pauli_z,
+    "S": Tableau.s,
+    "Adjoint(S)": _sdg,
+    "CNOT": Tableau.cnot,
+    "CZ": _cz,
+    "CY": _cy,
+    "SWAP": _swap,
+}
+
+
+def pauli_terms(observable, wire_map):
+    """The observable as ``(coefficient, x bits, z bits)`` terms, or ``None`` if it is not a
+    combination of Pauli words."""
+    try:
+        coefficients, observables = observable.terms()
+    except Exception:  # pylint: disable=broad-except
+        coefficients, observables = [1.0], [observable]
+
+    terms = []
+    for coefficient, term in zip(coefficients, observables):
+        if not qml.pauli.is_pauli_word(term):
+            return None
+        word = qml.pauli.pauli_word_to_string(term, wire_map)
+        x = [c in "XY" for c in word]
+        z = [c in "YZ" for c in word]
+        terms.append((float(coefficient), x, z))
+    return terms
+
+
+def compile_tape(tape):
+    """The tableau program of a tape.
+
+    Returns:
+        (tuple(list, list, dict)): The ``(name, wires)`` gates, the measurement
+        evaluators and the wire map, or ``None`` if the tape is not Clifford-only or
+        measures something the tableau cannot.
+    """
+    wire_map = {wire: index for index, wire in enumerate(tape.wires)}
+
+    gates = []
+    for operation in tape.operations:
+        flattened = flatten(operation, _GATES)
+        if flattened is None:
+            return None
+        gates += flattened
+
+    measurements = []
+    for measurement in tape.measurements:
+        if isinstance(measurement, qml.measurements.ExpectationMP):
+            terms = pauli_terms(measurement.obs, wire_map)
+            if terms is None:
+                return None
+            measurements.append(
+                lambda tableau, terms=terms: sum(c * tableau.expval(x, z) for c, x, z in terms)
+            )
+        elif isinstance(measurement, qml.measurements.ProbabilityMP) and measurement.obs is None:
+            qubits = [wire_map[wire] for wire in (measurement.wires or tape.wires)]
+            measurements.append(lambda tableau, qubits=qubits: _dense_probs(tableau, qubits))
+        else:
+            return None
+
+    return gates, measurements, wire_map
+
+
+def _dense_probs(tableau, qubits):
+    probs = np.zeros(2 ** len(qubits))
+    for bits, probability in tableau.distribution(qubits).items():
+        probs[int("".join(map(str, bits)) or "0", 2)] = probability
+    return probs
+
+
+def is_clifford(tape):
+    """Whether ``execute`` runs the tape on a tableau."""
+    return compile_tape(tape) is not None
+
+
+def execute(tape, device=None):
+    """Executes a tape on a stabilizer tableau if it is Clifford-only, else on ``device``.
+
+    Args:
+        tape (pennylane.tape.QuantumTape): The tape.
+        device (pennylane.Device): The statevector fallback. Defaults to
+            ``default.qubit`` on the tape's wires.
+
+    Returns:
+        The measurement results, a single one unpacked like a QNode does.
+    """
+    program = compile_tape(tape)
+    if program is None:
+        device = device or qml.device("default.qubit", wires=tape.wires)
+        return qml.execute([tape], device, None)[0]
+
+    gates, measurements, wire_map = program
+    tableau = Tableau(len(wire_map))
+    for name, wires in gates:
+        _GATES[name](tableau, *(wire_map[wire] for wire in wires))
+
+    results = [measure(tableau) for measure in measurements]
+    return results[0] if len(results) == 1 else tuple(results)
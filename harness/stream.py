@@ -0,0 +1,94 @@
+"""Streaming evaluation of large test case corpora stored as JSON lines.
+
+Each input line is a record ``{"input": ..., "expected": ...}`` for one script.
+Records are read lazily, evaluated in chunks through ``bulk.run_bulk`` (which uses
+the script's ``run_batch`` when it has one) and written back as one JSON verdict
+per line, in input order. At most ``window`` chunks are in flight, so memory use
+does not depend on the size of the corpus.
+"""
+
+import collections
+import contextlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .bulk import run_bulk
+from .loader import ROOT
+
+CHUNK_SIZE = 256
+
+
+def _as_text(value):
+    # ``run`` and ``check`` take strings; plain JSON values are accepted for convenience.
+    return value if isinstance(value, str) or value is None else json.dumps(value)
+
+
+def read_records(lines):
+    """Parses JSON lines into ``(index, input, expected_output)`` cases.
+
+    Args:
+        lines (iterable(str)): The lines of a JSONL file. Blank lines are skipped.
+
+    Yields:
+        (tuple(int, str, str)): The running index and the record's fields.
+    """
+    index = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        yield index, _as_text(record["input"]), _as_text(record["expected"])
+        index += 1
+
+
+def stream_results(
+    path, cases, workers=None, root=ROOT, chunk_size=CHUNK_SIZE, window=None, executor=None, check=None
+):
+    """Evaluates a lazy sequence of cases for one script.
+
+    Args:
+        path (str): The script path, relative to ``root``.
+        cases (iterable(tuple)): ``(index, input, expected_output)`` triples.
+        workers (int): Number of worker processes. Defaults to the number of cores.
+        root (str): The repository root.
+        chunk_size (int): Cases per job.
+        window (int): Maximum number of jobs in flight. Defaults to twice the
+            number of workers.
+        executor (concurrent.futures.Executor): An existing pool to submit to.
+        check (callable): Used instead of the script's ``check`` if given. It must be
+            picklable, e.g. a module-level function.
+
+    Yields:
+        (dict): One result per case, in input order, as produced by ``runner.run_case``.
+    """
+    workers = workers or os.cpu_count()
+    window = window or 2 * workers
+    cases = iter(cases)
+
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+        pending = collections.deque()
+        while True:
+            while len(pending) < window:
+                chunk = list(itertools.islice(cases, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(run_bulk, path, chunk, root, chunk_size, check))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def write_results(results, stream, keep_stdout=False):
+    """Writes results as JSON lines and returns the number of cases per verdict."""
+    counts = collections.Counter()
+    for result in results:
+        if not keep_stdout:
+            result.pop("stdout", None)
+        counts[result["verdict"]] += 1
+        stream.write(json.dumps(result, default=str) + "\n")
+    stream.flush()
+    return counts
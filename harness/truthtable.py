@@ -0,0 +1,148 @@
+"""Full truth tables of Boolean-gate circuits from a single pass over their gates.
+
+The challenges load classical bits with ``if bit == 1: qml.PauliX(...)`` on wires that
+no gate touches before, and are then evaluated input by input. Loading a bit that way
+is the same as starting that wire in ``|bit>``, so the outputs for all ``2^k`` inputs
+are the columns of the circuit's unitary at the basis states the bits select. The
+unitary is built once and applied to all inputs as one batched statevector.
+
+Circuits that pick a gate from the bits, like the superdense encoding, are brought
+into that form by turning the classical choice into a gate controlled on fresh input
+wires.
+"""
+
+import collections
+import functools
+import itertools
+
+import numpy as np
+import pennylane as qml
+from scipy.linalg import block_diag
+
+from .loader import ROOT
+from .runner import get_challenge
+
+# ``circuit`` takes the loaded script and returns the quantum function with every input
+# bit set to 0. ``expected`` maps the input bits to the index of the output basis state.
+Spec = collections.namedtuple(
+    "Spec", ["circuit", "wires", "input_wires", "output_wires", "expected"]
+)
+
+
+def truth_table(qfunc, wires, input_wires, output_wires):
+    """Output probabilities of a circuit for every basis input.
+
+    Args:
+        qfunc (callable): The circuit with all inputs at ``|0>``. Its measurements are ignored.
+        wires (list): All wires, first wire most significant.
+        input_wires (list): The wires holding the input bits, first bit most significant.
+        output_wires (list): The wires whose joint distribution is returned.
+
+    Returns:
+        (numpy.array): Row ``b`` holds the probabilities over ``output_wires`` for input ``b``.
+    """
+    wires = list(wires)
+    num_wires = len(wires)
+    unitary = np.asarray(qml.matrix(qfunc, wire_order=wires)())
+
+    # The basis index of every input pattern, with all other wires at |0>.
+    weights = [2 ** (num_wires - 1 - wires.index(wire)) for wire in input_wires]
+    patterns = np.arange(2 ** len(input_wires))
+    bits = (patterns[:, None] >> np.arange(len(input_wires))[::-1]) & 1
+    states = unitary[:, bits @ weights].T
+
+    probs = (np.abs(states) ** 2).reshape((len(patterns),) + (2,) * num_wires)
+    kept = [1 + wires.index(wire) for wire in output_wires]
+    traced = tuple(axis for axis in range(1, num_wires + 1) if axis not in kept)
+    probs = probs.sum(axis=traced)
+
+    # The axes still in ``probs`` are in wire order; put them in ``output_wires`` order.
+    remaining = sorted(kept)
+    sources = [1 + remaining.index(axis) for axis in kept]
+    probs = np.moveaxis(probs, sources, range(1, len(kept) + 1))
+    return probs.reshape(len(patterns), -1)
+
+
+def mismatches(table, expected, atol=1e-8):
+    """Inputs whose output is not the one of the classical function.
+
+    Args:
+        table (numpy.array): A table as returned by ``truth_table``.
+        expected (callable): Maps the input bits to the index of the expected output.
+        atol (float): Allowed deviation of the expected output's probability from 1.
+
+    Returns:
+        (list(tuple)): The input bits and the probability of the expected output, for
+        every input whose probability is off.
+    """
+    num_bits = int(np.log2(len(table)))
+    failures = []
+    for pattern, row in enumerate(table):
+        bits = tuple((pattern >> shift) & 1 for shift in reversed(range(num_bits)))
+        probability = float(row[expected(*bits)])
+        if not np.isclose(probability, 1, rtol=0, atol=atol):
+            failures.append((bits, probability))
+    return failures
+
+
+def _and_gate(module):
+    return functools.partial(module.AND.func, 0, 0)
+
+
+def _teleport(module):
+    return functools.partial(module.circuit.func, 0, 0)
+
+
+def _superdense(module):
+    # The script's encode for every bit pattern, controlled on the input wires.
+    select = block_diag(
+        *(
+            qml.matrix(functools.partial(module.encode, *bits), wire_order=[0, 1, 2])()
+            for bits in itertools.product(range(2), repeat=3)
+        )
+    )
+
+    def circuit():
+        module.prepare()
+        qml.QubitUnitary(select, wires=["i", "j", "k", 0, 1, 2])
+        module.decode()
+
+    return circuit
+
+
+TABLES = {
+    "bending-bennett's-laws/a-AC.py": Spec(
+        circuit=_and_gate,
+        wires=[0, 1, 2],
+        input_wires=[1, 2],
+        output_wires=[0],
+        expected=lambda j, k: j & k,
+    ),
+    "bending-bennett's-laws/b-AC.py": Spec(
+        circuit=_superdense,
+        wires=["i", "j", "k", 0, 1, 2],
+        input_wires=["i", "j", "k"],
+        output_wires=[0, 1, 2],
+        expected=lambda i, j, k: 4 * i + 2 * j + k,
+    ),
+    "bending-bennett's-laws/e-AC.py": Spec(
+        circuit=_teleport,
+        wires=["z0", "z1", "r1", "r0"],
+        input_wires=["z0", "r0"],
+        output_wires=["z0", "z1", "r1", "r0"],
+        expected=lambda j, k: 10 * j + 5 * k,
+    ),
+}
+
+
+def check_script(path, root=ROOT, atol=1e-8):
+    """Computes the truth table of a registered script and compares it with its function.
+
+    Returns:
+        (tuple(numpy.array, list(tuple))): The table and its mismatches.
+    """
+    spec = TABLES[path]
+    table = truth_table(
+        spec.circuit(get_challenge(path, root)), spec.wires, spec.input_wires, spec.output_wires
+    )
+    return table, mismatches(table, spec.expected, atol)
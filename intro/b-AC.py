@@ -34,6 +34,14 @@ def run(test_case_input: str) -> str:
     return str(output)
 
 
+def run_batch(test_case_inputs: list) -> list:
+    # Each column of angles is broadcast over, so all cases run in one circuit call.
+    angles = np.array([json.loads(test_case_input) for test_case_input in test_case_inputs])
+    outputs = np.atleast_2d(circuit(angles.T)).tolist()
+
+    return [str(output) for output in outputs]
+
+
 def check(solution_output: str, expected_output: str) -> None:
     solution_output = json.loads(solution_output)
     expected_output = json.loads(expected_output)
@@ -1,3 +1,4 @@
+import itertools
 import json
 import pennylane as qml
 import pennylane.numpy as np
@@ -17,6 +18,50 @@ def error(error_key, qubit):
     getattr(qml, error_dict[error_key])(qubit)
 
 
+def cx_cascade():
+    qml.CNOT(wires=[0, 1])
+    qml.CNOT(wires=[0, 2])
+
+    qml.CNOT(wires=[3, 4])
+    qml.CNOT(wires=[3, 5])
+
+    qml.CNOT(wires=[6, 7])
+    qml.CNOT(wires=[6, 8])
+
+
+def hadamard_cascade():
+    qml.Hadamard(wires=0)
+    qml.Hadamard(wires=3)
+    qml.Hadamard(wires=6)
+
+
+def toffolis():
+    qml.Toffoli(wires=[2, 1, 0])
+    qml.Toffoli(wires=[5, 4, 3])
+    qml.Toffoli(wires=[8, 7, 6])
+
+
+def encode():
+    """Spreads the state of the first qubit over all nine qubits."""
+    qml.CNOT(wires=[0, 3])
+    qml.CNOT(wires=[0, 6])
+
+    hadamard_cascade()
+    cx_cascade()
+
+
+def decode():
+    """Corrects a single error and gathers the state back on the first qubit."""
+    cx_cascade()
+    toffolis()
+    hadamard_cascade()
+
+    qml.CNOT(wires=[0, 3])
+    qml.CNOT(wires=[0, 6])
+
+    qml.Toffoli(wires=[6, 3, 0])
+
+
 @qml.qnode(dev)
 def shor(state, error_key, qubit):
     """A circuit defining Shor's code for error correction.
@@ -32,44 +77,82 @@ def shor(state, error_key, qubit):
     qml.QubitStateVector(np.array(state), wires=0)
 
     # Put your code here #
-    def cx_cascade():
-        qml.CNOT(wires=[0, 1])
-        qml.CNOT(wires=[0, 2])
+    encode()
+
+    error(error_key, qubit)
 
-        qml.CNOT(wires=[3, 4])
-        qml.CNOT(wires=[3, 5])
+    decode()
 
-        qml.CNOT(wires=[6, 7])
-        qml.CNOT(wires=[6, 8])
+    return [qml.expval(qml.PauliZ(i)) for i in range(9)]
 
-    def hadamard_cascade():
-        qml.Hadamard(wires=0)
-        qml.Hadamard(wires=3)
-        qml.Hadamard(wires=6)
 
-    def toffolis():
-        qml.Toffoli(wires=[2, 1, 0])
-        qml.Toffoli(wires=[5, 4, 3])
-        qml.Toffoli(wires=[8, 7, 6])
+def apply_circuit(qfunc, states):
+    """Applies the gates of a quantum function to a batch of 9-qubit states.
 
-    qml.CNOT(wires=[0, 3])
-    qml.CNOT(wires=[0, 6])
+    Each gate is contracted with the batch on its own wires, so no 2**9 x 2**9 matrix
+    is ever built.
 
-    hadamard_cascade()
-    cx_cascade()
+    Args:
+        qfunc (callable): A quantum function without arguments or measurements.
+        states (numpy.array): States of shape (N, 2**9).
 
-    error(error_key, qubit)
+    Returns:
+        (numpy.array): The resulting states, of shape (N, 2**9).
+    """
+    with qml.tape.QuantumTape() as tape:
+        qfunc()
 
-    cx_cascade()
-    toffolis()
-    hadamard_cascade()
+    tensor = np.reshape(states, (len(states),) + (2,) * n_qubits)
+    for op in tape.operations:
+        k = len(op.wires)
+        matrix = np.reshape(qml.matrix(op), (2,) * 2 * k)
+        axes = [1 + wire for wire in op.wires]
+        tensor = np.tensordot(tensor, matrix, axes=[axes, list(range(k, 2 * k))])
+        tensor = np.moveaxis(tensor, list(range(-k, 0)), axes)
+    return np.reshape(tensor, (len(states), -1))
 
-    qml.CNOT(wires=[0, 3])
-    qml.CNOT(wires=[0, 6])
 
-    qml.Toffoli(wires=[6, 3, 0])
+def shor_sweep(states, pairs=False):
+    """Runs Shor's code for every single error, and optionally every pair of errors on
+    different qubits, for a batch of input states.
 
-    return [qml.expval(qml.PauliZ(i)) for i in range(9)]
+    All input states are encoded together once and every error is applied to that
+    encoded batch. The corrupted states of all errors are then decoded together in a
+    single pass.
+
+    Args:
+        states (list(list(float))): The quantum states of the first qubit.
+        pairs (bool): Whether to also inject every pair of errors on different qubits.
+
+    Returns:
+        (list(tuple), numpy.array): The injected errors, each a tuple of (error_key, qubit)
+        pairs, and the expectation values of the Pauli Z operator on every qubit, of
+        shape (number of errors, number of states, 9).
+    """
+    states = np.array(states)
+
+    # The input state lives on the first qubit, i.e. on basis states 0 and 2**8.
+    initial = np.zeros((len(states), 2**n_qubits), dtype=complex)
+    initial[:, [0, 2 ** (n_qubits - 1)]] = states
+    encoded = apply_circuit(encode, initial)
+
+    singles = [(error_key, qubit) for error_key in error_dict for qubit in range(n_qubits)]
+    errors = [(single,) for single in singles]
+    if pairs:
+        errors += [(a, b) for a, b in itertools.combinations(singles, 2) if a[1] != b[1]]
+
+    def errors_of(injected):
+        return lambda: [error(error_key, qubit) for error_key, qubit in injected]
+
+    corrupted = [apply_circuit(errors_of(injected), encoded) for injected in errors]
+    decoded = apply_circuit(decode, np.concatenate(corrupted))
+
+    # signs[b, i] is the eigenvalue of PauliZ on qubit i for the basis state b.
+    basis = np.arange(2**n_qubits)[:, None] >> np.arange(n_qubits - 1, -1, -1)
+    signs = 1 - 2 * (basis & 1)
+
+    expectations = np.abs(decoded) ** 2 @ signs
+    return errors, np.reshape(expectations, (len(errors), len(states), n_qubits))
 
 
 # These functions are responsible for testing the solution.
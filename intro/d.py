@@ -1,7 +1,166 @@
+import collections
+import itertools
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as onp
 import pennylane as qml
 import pennylane.numpy as np
 
+# Inputs are rounded to 6 decimals, so a product state can have a second Schmidt
+# coefficient of order 1e-6. Entangled test states are far above this.
+TOLERANCE = 1e-5
+
+
+def subsystem_axes(subsystem, wires):
+    """The positions of the subsystem's wires among the wires of the state."""
+    wires = list(wires)
+    if len(set(wires)) != len(wires):
+        raise ValueError(f"The wire labels {wires} are not distinct.")
+    unknown = [wire for wire in subsystem if wire not in wires]
+    if unknown or len(set(subsystem)) != len(subsystem):
+        raise ValueError(f"The subsystem {subsystem} is not a set of the wires {wires}.")
+    return [wires.index(wire) for wire in subsystem]
+
+
+def state_tensors(states, wires):
+    """Reshapes statevectors into tensors with one axis of size 2 per wire."""
+    states = onp.asarray(states)
+    if states.shape[-1] != 2 ** len(wires):
+        raise ValueError(f"A state of {len(wires)} wires has {2 ** len(wires)} amplitudes.")
+    return onp.reshape(states, states.shape[:-1] + (2,) * len(wires))
+
+
+def _matrices(tensors, first, num_wires):
+    """Moves the wire axes ``first`` of every tensor to the front and flattens both sides."""
+    offset = tensors.ndim - num_wires
+    rest = [axis for axis in range(num_wires) if axis not in first]
+    tensors = onp.transpose(
+        tensors, list(range(offset)) + [offset + axis for axis in list(first) + rest]
+    )
+    return onp.reshape(tensors, tensors.shape[:offset] + (2 ** len(first), 2 ** len(rest)))
+
+
+def schmidt_matrices(states, subsystem, wires):
+    """Reshapes statevectors into matrices whose rows are indexed by the subsystem.
+
+    Args:
+        states (numpy.array): A state, or an array of states along the leading axes.
+        subsystem (list): The wire labels of the subsystem.
+        wires (list): The wire labels of the state, first wire most significant.
+
+    Returns:
+        (numpy.array): The states as matrices of shape (2^|subsystem|, 2^|rest|).
+    """
+    first = subsystem_axes(subsystem, wires)
+    return _matrices(state_tensors(states, list(wires)), first, len(wires))
+
+
+def _normalized_singular_values(matrices):
+    coefficients = onp.linalg.svd(matrices, compute_uv=False)
+    return coefficients / onp.linalg.norm(coefficients, axis=-1, keepdims=True)
+
+
+def schmidt_coefficients(states, subsystem, wires):
+    """The Schmidt coefficients of states across the subsystem and the remaining wires.
+
+    Args:
+        states (numpy.array): A state, or an array of states along the leading axes.
+        subsystem (list): The wire labels of the subsystem.
+        wires (list): The wire labels of the state.
+
+    Returns:
+        (numpy.array): The coefficients of each state in decreasing order, normalized
+        as if the state had norm 1.
+    """
+    return _normalized_singular_values(schmidt_matrices(states, subsystem, wires))
+
+
+def schmidt_ranks(states, subsystem, wires, tol=TOLERANCE):
+    """The number of Schmidt coefficients above tol, for every state."""
+    return onp.sum(schmidt_coefficients(states, subsystem, wires) > tol, axis=-1)
+
+
+def are_product(states, subsystem, wires, tol=TOLERANCE):
+    """Whether each of many states is a product state between the subsystem and the rest.
+
+    A pure state is a product state exactly when its Schmidt rank is 1, so this never
+    forms a density matrix and only needs the singular values of a
+    2^|subsystem| x 2^|rest| matrix per state.
+
+    Args:
+        states (numpy.array): An array of states along the leading axes.
+        subsystem (list): The wire labels of the subsystem.
+        wires (list): The wire labels of the states.
+        tol (float): Schmidt coefficients up to this are treated as 0.
+
+    Returns:
+        (numpy.array): A boolean for every state.
+    """
+    return schmidt_ranks(states, subsystem, wires, tol) == 1
+
+
+# The Schmidt rank and the entanglement entropy of every state across one bipartition.
+Entanglement = collections.namedtuple("Entanglement", ["ranks", "entropies"])
+
+
+def bipartitions(wires):
+    """Every split of the wires into two nonempty parts, as the part holding the first wire."""
+    wires = list(wires)
+    return [
+        [wires[0], *chosen]
+        for size in range(len(wires) - 1)
+        for chosen in itertools.combinations(wires[1:], size)
+    ]
+
+
+def entanglement(states, wires, subsystems=None, tol=TOLERANCE, base=None, workers=None):
+    """The Schmidt rank and entanglement entropy of states across many bipartitions.
+
+    The states are reshaped into tensors once. The Schmidt coefficients do not depend on
+    the order of the wires in either part or on which part is the subsystem, so every
+    bipartition is reduced to the sorted part holding the first wire and each distinct
+    one is decomposed once. Parts made of the leading wires need no transposition at
+    all. The SVDs run in a thread pool, since LAPACK releases the GIL.
+
+    Args:
+        states (numpy.array): A state, or an array of states along the leading axes.
+        wires (list): The wire labels of the states.
+        subsystems (list(list)): The subsystems to split off. Defaults to all bipartitions.
+        tol (float): Schmidt coefficients up to this are treated as 0.
+        base (float): The base of the logarithm in the entropy. Defaults to e.
+        workers (int): The number of threads. Defaults to the executor's default.
+
+    Returns:
+        (dict): Maps each subsystem, as a tuple, to the ``Entanglement`` of every state.
+    """
+    wires = list(wires)
+    subsystems = bipartitions(wires) if subsystems is None else subsystems
+    tensors = state_tensors(states, wires)
+
+    canonical = {}
+    for subsystem in subsystems:
+        first = set(subsystem_axes(subsystem, wires))
+        if 0 not in first:
+            first = set(range(len(wires))) - first
+        canonical[tuple(subsystem)] = tuple(sorted(first))
+
+    def analyze(first):
+        coefficients = _normalized_singular_values(_matrices(tensors, first, len(wires)))
+        probabilities = onp.asarray(coefficients) ** 2
+        logs = onp.log(onp.where(probabilities > 0, probabilities, 1))
+        entropies = -onp.sum(probabilities * logs, axis=-1)
+        if base is not None:
+            entropies = entropies / onp.log(base)
+        return Entanglement(onp.sum(coefficients > tol, axis=-1), entropies)
+
+    distinct = list(dict.fromkeys(canonical.values()))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = dict(zip(distinct, executor.map(analyze, distinct)))
+
+    return {subsystem: results[first] for subsystem, first in canonical.items()}
+
+
 def is_product(state, subsystem, wires):
     """Determines if a pure quantum state can be written as a product state between 
     a subsystem of wires and their compliment.
@@ -15,61 +174,7 @@ def is_product(state, subsystem, wires):
         (str): "yes" if the state is a product state or "no" if it isn't.
     """
 
-    print("STATE:")
-    print(state)
-    print("SUBSYSTEMS:")
-    print(subsystem)
-    print("WIRES:")
-    print(wires)
-    
-    def is_diagonal(state):
-        diag_total = 0
-        for i in range(len(state[0])):
-            diag_total += abs(state[i][i]) ** 2
-            
-        n = 1 / np.sqrt(diag_total)
-        
-        diag_total = 0
-        for i in range(len(state[0])):
-            diag_total += state[i][i] * n
-    
-        if not diag_total == 1:
-            return False
-        
-        for i in range(len(state[0])):
-            for j in range(len(state[0])):
-                if i != j:
-                    if not state[i][j] == 0:
-                        return False
-                    if not state[j][i] == 0:
-                        return False
-        return True
-    
-    # make sure the state is pure
-    dagger = np.transpose(np.atleast_2d(state)).conj()
-    print("COMPLEX CONJUGAT TRANSPOSE:")
-    print(dagger)
-    
-    density_matrix = np.matmul(dagger, np.atleast_2d(state))
-    print("DENSITY MATRIX:")
-    print(density_matrix)
-    
-    if not is_diagonal(density_matrix):
-        return "no"
-    
-    # attempt Schmidt decomposition
-    try:
-        U, coeffs, V_dagger = np.linalg.svd(density_matrix)
-    except Exception as e:
-        print(f"svd impossible: {e}")
-        return "no"
-    
-    print("DECOMPOSITION:")
-    print(U)
-    print(coeffs)
-    print(V_dagger)
-    
-    return "yes"
+    return "yes" if are_product(state, subsystem, wires) else "no"
 
 # These functions are responsible for testing the solution.
 def run(test_case_input: str) -> str:
@@ -1,22 +1,90 @@
+import hashlib
 import json
+import os
 import pennylane as qml
 import pennylane.numpy as np
 
+HAMILTONIAN_CACHE = os.environ.get(
+    "H2_HAMILTONIAN_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "qhack2023-h2")
+)
 
-def hydrogen_hamiltonian(coordinates, charge):
+# Geometries whose coordinates agree to this many decimals share a cache entry.
+COORDINATE_DECIMALS = 6
+
+
+def hamiltonian_key(coordinates, charge, basis):
+    """The cache key of the hydrogen Hamiltonian for a geometry, charge and basis set.
+
+    The installed pennylane version is part of the key, since the qubit mapping and the
+    term order may change between releases.
+    """
+    # Adding 0.0 turns the -0.0 that rounding small negatives gives into 0.0.
+    rounded = [round(float(x), COORDINATE_DECIMALS) + 0.0 for x in np.ravel(coordinates)]
+    description = json.dumps([["H", "H"], rounded, int(charge), basis.upper(), qml.__version__])
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def save_hamiltonian(filename, hamiltonian):
+    """Writes a Hamiltonian as its coefficients and Pauli words to a JSON file."""
+    coefficients, observables = hamiltonian.terms()
+    wires = list(hamiltonian.wires)
+    wire_map = {wire: i for i, wire in enumerate(wires)}
+    entry = {
+        "wires": wires,
+        "coefficients": [float(c) for c in coefficients],
+        "words": [qml.pauli.pauli_word_to_string(o, wire_map) for o in observables],
+    }
+
+    # Write to a temporary file first so a concurrent reader never sees half an entry.
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    partial = f"{filename}.{os.getpid()}.tmp"
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(partial, filename)
+
+
+def load_hamiltonian(filename):
+    """Reads a Hamiltonian written by save_hamiltonian, or returns None if there is none."""
+    try:
+        with open(filename, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    wire_map = {wire: i for i, wire in enumerate(entry["wires"])}
+    observables = [qml.pauli.string_to_pauli_word(word, wire_map) for word in entry["words"]]
+    return qml.Hamiltonian(entry["coefficients"], observables)
+
+
+def hydrogen_hamiltonian(coordinates, charge, basis="STO-3G", cache=HAMILTONIAN_CACHE):
     """Calculates the qubit Hamiltonian of the hydrogen molecule.
 
+    Hamiltonians are kept on disk, keyed on the rounded coordinates, the charge and the
+    basis set, so scans that revisit a geometry skip the quantum chemistry.
+
     Args:
         coordinates (list(float)): Cartesian coordinates of each hydrogen molecule.
         charge (int): The electric charge given to the hydrogen molecule.
+        basis (str): The atomic basis set.
+        cache (str): The directory of the cache, or None to always compute the Hamiltonian.
 
     Returns:
         (qml.Hamiltonian): A PennyLane Hamiltonian.
     """
-    return qml.qchem.molecular_hamiltonian(
-        ["H", "H"], coordinates, charge, basis="STO-3G"
+    if cache is not None:
+        filename = os.path.join(cache, hamiltonian_key(coordinates, charge, basis) + ".json")
+        hamiltonian = load_hamiltonian(filename)
+        if hamiltonian is not None:
+            return hamiltonian
+
+    hamiltonian = qml.qchem.molecular_hamiltonian(
+        ["H", "H"], coordinates, charge, basis=basis
     )[0]
 
+    if cache is not None:
+        save_hamiltonian(filename, hamiltonian)
+    return hamiltonian
+
 
 def num_electrons(charge):
     """The total number of electrons in the hydrogen molecule.
@@ -33,6 +33,15 @@ def run(test_case_input: str) -> str:
     return str(state)
 
 
+def run_batch(test_case_inputs: list) -> list:
+    # hour and minute are broadcast over, so all cases run in one circuit call.
+    hours, minutes = np.array(
+        [json.loads(test_case_input) for test_case_input in test_case_inputs]
+    ).T
+    states = np.atleast_2d(time(hours, minutes))
+    return [str([float(x) for x in state]) for state in states]
+
+
 def check(solution_output, expected_output: str) -> None:
     solution_output = json.loads(solution_output)
     expected_output = json.loads(expected_output)